@@ -0,0 +1,90 @@
+"""
+Dominant-color extraction: fast engine vs sklearn KMeans
+
+Times both methods on synthetic text crops (and optionally a directory of real
+crops) and checks that the fast engine matches KMeans: the two dominant colors must be
+within --tolerance per channel and the contrast ratio within 5%, or else both must
+reach the same WCAG verdicts (4.5:1 and 3:1).
+
+Usage: python benchmarks/dominant_colors.py [--crops path/to/crops] [--count 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.vision.contrast_analyzer import ContrastAnalyzer
+
+def synthetic_crops(count, seed=0):
+    """Anti-aliased text in a random color on a random background, with sensor noise"""
+    rng = np.random.default_rng(seed)
+    crops = []
+    for _ in range(count):
+        height = int(rng.integers(20, 120))
+        width = int(rng.integers(80, 800))
+        background = rng.integers(0, 256, 3)
+        foreground = rng.integers(0, 256, 3)
+        crop = np.empty((height, width, 3), dtype=np.uint8)
+        crop[:] = background
+        cv2.putText(crop, "Accessible text 123", (4, height - height // 4), cv2.FONT_HERSHEY_SIMPLEX,
+                    height / 60, tuple(int(c) for c in foreground), max(1, height // 25), cv2.LINE_AA)
+        noise = rng.normal(0, 3, crop.shape)
+        crops.append(np.clip(crop + noise, 0, 255).astype(np.uint8))
+    return crops
+
+def real_crops(directory):
+    crops = []
+    for filename in sorted(os.listdir(directory)):
+        image = cv2.imread(os.path.join(directory, filename))
+        if image is not None:
+            crops.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    return crops
+
+def compare(name, crops, analyzer, tolerance):
+    timings = {}
+    results = {}
+    for method in ("kmeans", "fast"):
+        start = time.perf_counter()
+        results[method] = [analyzer.extract_dominant_colors(crop, method=method) for crop in crops]
+        timings[method] = (time.perf_counter() - start) / len(crops) * 1000
+
+    mismatches = 0
+    worst = 0
+    for reference, fast in zip(results["kmeans"], results["fast"]):
+        if len(fast) < 2 or len(reference) < 2:
+            continue
+        channel_error = max(max(abs(a - b) for a, b in zip(r, f)) for r, f in zip(reference[:2], fast[:2]))
+        reference_ratio = analyzer.calculate_contrast_ratio(*reference[:2])
+        fast_ratio = analyzer.calculate_contrast_ratio(*fast[:2])
+        close = channel_error <= tolerance and abs(reference_ratio - fast_ratio) / reference_ratio <= 0.05
+        same_verdict = all((reference_ratio >= t) == (fast_ratio >= t) for t in (4.5, 3.0))
+        worst = max(worst, channel_error)
+        if not (close or same_verdict):
+            mismatches += 1
+
+    print(f"{name}: {len(crops)} crops")
+    print(f"  kmeans {timings['kmeans']:8.2f} ms/crop")
+    print(f"  fast   {timings['fast']:8.2f} ms/crop  ({timings['kmeans'] / timings['fast']:.0f}x)")
+    print(f"  parity: {len(crops) - mismatches}/{len(crops)} within tolerance, worst channel error {worst}")
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crops", help="Directory of real text crops")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--tolerance", type=int, default=12, help="Max per-channel difference in dominant colors")
+    args = parser.parse_args()
+
+    analyzer = ContrastAnalyzer()
+    mismatches = compare("synthetic", synthetic_crops(args.count), analyzer, args.tolerance)
+    if args.crops:
+        mismatches += compare("real", real_crops(args.crops), analyzer, args.tolerance)
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Parse time per HTML parser backend on a corpus of saved pages
+
+Usage: python benchmarks/parser_backends.py path/to/saved/pages [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from scanner.parsers import PARSER_BACKENDS
+from scanner.rules import rule_engine
+
+def load_corpus(directory):
+    """Read every .html/.htm file under directory"""
+    pages = []
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if filename.endswith((".html", ".htm")):
+                with open(os.path.join(root, filename), encoding="utf-8", errors="replace") as f:
+                    pages.append((filename, f.read()))
+    return pages
+
+def bench_backend(backend, pages, repeat):
+    """Best-of-repeat parse time and parse+rules time over the corpus, in seconds"""
+    best_parse = best_total = float("inf")
+    for _ in range(repeat):
+        parse_time = rules_time = 0.0
+        for _, html in pages:
+            start = time.perf_counter()
+            root = backend.parse(html)
+            parsed = time.perf_counter()
+            rule_engine.run(root, "full", children=backend.children)
+            parse_time += parsed - start
+            rules_time += time.perf_counter() - parsed
+        best_parse = min(best_parse, parse_time)
+        best_total = min(best_total, parse_time + rules_time)
+    return best_parse, best_total
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("corpus", help="Directory of saved HTML pages")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        sys.exit(f"No .html files found in {args.corpus}")
+    total_mb = sum(len(html.encode("utf-8")) for _, html in pages) / 1e6
+    print(f"{len(pages)} pages, {total_mb:.1f} MB, best of {args.repeat}\n")
+
+    print(f"{'backend':<14}{'parse (s)':>12}{'MB/s':>10}{'parse+rules (s)':>18}")
+    for name, backend in PARSER_BACKENDS.items():
+        if not backend.is_available():
+            print(f"{name:<14}{'not installed':>12}")
+            continue
+        parse_time, total_time = bench_backend(backend, pages, args.repeat)
+        print(f"{name:<14}{parse_time:>12.3f}{total_mb / parse_time:>10.1f}{total_time:>18.3f}")
+
+if __name__ == "__main__":
+    main()
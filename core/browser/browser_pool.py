@@ -0,0 +1,210 @@
+import queue
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from core.config import BROWSER_POOL_SIZE, BROWSER_MAX_PAGES, BROWSER_MAX_MEMORY_MB
+
+logger = logging.getLogger("accessai.browser.pool")
+
+def headless_chrome_options():
+    """Chrome options shared by every headless browser"""
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--window-size=1920,1080')
+    # driver.get returns at DOMContentLoaded; PageReadiness decides how much longer to wait
+    options.page_load_strategy = 'eager'
+    return options
+
+class PooledBrowser:
+    """A warm headless Chrome owned by a BrowserPool"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.home_handle = driver.current_window_handle
+        self.pages_served = 0
+        self.created_at = time.time()
+
+    def is_healthy(self):
+        """Whether the browser still answers commands"""
+        try:
+            self.driver.switch_to.window(self.home_handle)
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def memory_mb(self):
+        """
+        Resident memory of the browser processes in MB
+        Returns None when psutil is not installed
+        """
+        try:
+            import psutil
+        except ImportError:
+            return None
+
+        try:
+            driver_process = psutil.Process(self.driver.service.process.pid)
+            processes = [driver_process] + driver_process.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Failed to quit browser: {str(e)}")
+
+class BrowserPool:
+    """
+    Fixed-size pool of warm headless browsers
+    Each lease runs in its own browser context (separate cookies and storage) and tab.
+    Browsers are recycled after max_pages_per_browser pages, above max_memory_mb,
+    or when they stop answering.
+    """
+
+    def __init__(self, size=2, max_pages_per_browser=100, max_memory_mb=1024, options_factory=headless_chrome_options):
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_memory_mb = max_memory_mb
+        self.options_factory = options_factory
+
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def _launch(self):
+        driver = webdriver.Chrome(options=self.options_factory())
+        logger.info("Launched pooled headless Chrome")
+        return PooledBrowser(driver)
+
+    def start(self):
+        """Launch all browsers up front so the first leases don't pay Chrome startup"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        for _ in range(self.size):
+            try:
+                self._idle.put(self._launch())
+            except Exception as e:
+                logger.error(f"Failed to launch pooled browser: {str(e)}")
+                # Keeping the slot so a lease retries the launch later
+                self._idle.put(None)
+
+    def _needs_recycling(self, browser):
+        if browser.pages_served >= self.max_pages_per_browser:
+            return True
+        memory = browser.memory_mb()
+        return memory is not None and memory > self.max_memory_mb
+
+    def _acquire(self, timeout):
+        self.start()
+        try:
+            browser = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No pooled browser available")
+
+        # Replacing empty slots and browsers that stopped responding
+        if browser is None or not browser.is_healthy():
+            if browser is not None:
+                logger.warning("Pooled browser failed health check, replacing it")
+                browser.close()
+            try:
+                browser = self._launch()
+            except Exception:
+                self._idle.put(None)
+                raise
+        return browser
+
+    def _release(self, browser):
+        if self._closed:
+            browser.close()
+            return
+
+        if self._needs_recycling(browser):
+            logger.info(f"Recycling pooled browser after {browser.pages_served} pages")
+            browser.close()
+            browser = None
+        self._idle.put(browser)
+
+    def _open_context(self, driver):
+        """
+        Open a tab in a fresh browser context through CDP
+        Falls back to a plain tab when the driver does not support it
+        """
+        try:
+            context_id = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+            target_id = driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+            )["targetId"]
+            driver.switch_to.window(target_id)
+            return context_id
+        except Exception:
+            driver.switch_to.new_window('tab')
+            return None
+
+    def _close_context(self, browser, context_id):
+        driver = browser.driver
+        try:
+            if context_id is not None:
+                driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+            else:
+                driver.delete_all_cookies()
+                driver.close()
+        finally:
+            driver.switch_to.window(browser.home_handle)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Lease a driver focused on an isolated tab for the duration of the block
+        """
+        browser = self._acquire(timeout)
+        context_id = None
+        try:
+            context_id = self._open_context(browser.driver)
+            yield browser.driver
+        finally:
+            browser.pages_served += 1
+            try:
+                self._close_context(browser, context_id)
+            except Exception as e:
+                logger.warning(f"Failed to close browser context: {str(e)}")
+                # A browser that cannot clean up is replaced on its next lease
+                browser.pages_served = self.max_pages_per_browser
+            self._release(browser)
+
+    def close(self):
+        """Quit every idle browser; leased ones are quit when returned"""
+        self._closed = True
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if browser is not None:
+                browser.close()
+
+# Process-wide pool, created on first use
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_default_pool():
+    """Shared pool sized by ACCESSAI_BROWSER_POOL_SIZE, ACCESSAI_BROWSER_MAX_PAGES and ACCESSAI_BROWSER_MAX_MEMORY_MB"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = BrowserPool(
+                size=BROWSER_POOL_SIZE,
+                max_pages_per_browser=BROWSER_MAX_PAGES,
+                max_memory_mb=BROWSER_MAX_MEMORY_MB
+            )
+        return _default_pool
@@ -0,0 +1,44 @@
+import logging
+from core.browser.text_styles import SELECTOR_FUNCTION
+
+logger = logging.getLogger("accessai.browser.interactive")
+
+INTERACTIVE_SELECTOR = ", ".join([
+    "a[href]", "area[href]", "button", "input:not([type=hidden])", "select", "textarea", "summary",
+    "[role=button]", "[role=link]", "[role=checkbox]", "[role=radio]", "[role=switch]",
+    "[role=tab]", "[role=menuitem]", "[role=option]", "[onclick]", "[tabindex]:not([tabindex='-1'])"
+])
+
+# Bounding boxes of all visible interactive elements in one script call.
+# Links inside running text are flagged inline, since WCAG 2.5.8 exempts them.
+INTERACTIVE_BOXES_SCRIPT = SELECTOR_FUNCTION + """
+const [selector, maxElements] = arguments;
+const results = [];
+for (const element of document.querySelectorAll(selector)) {
+    if (results.length >= maxElements) { break; }
+    const style = getComputedStyle(element);
+    if (style.visibility === 'hidden' || style.display === 'none' || style.pointerEvents === 'none') { continue; }
+    const rect = element.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) { continue; }
+
+    const parent = element.parentElement;
+    const inline = style.display === 'inline' && parent !== null &&
+        parent.textContent.trim().length > element.textContent.trim().length;
+
+    results.push({
+        selector: selectorFor(element),
+        tag: element.tagName.toLowerCase(),
+        role: element.getAttribute('role'),
+        inline: inline,
+        box: {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height}
+    });
+}
+return results;
+"""
+
+def collect_interactive_boxes(driver, max_elements=10000):
+    """
+    Boxes (CSS pixels, page coordinates) of the visible interactive elements of the loaded page
+    Returns a list of dicts with selector, tag, role, inline and box
+    """
+    return driver.execute_script(INTERACTIVE_BOXES_SCRIPT, INTERACTIVE_SELECTOR, max_elements)
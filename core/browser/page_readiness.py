@@ -0,0 +1,99 @@
+import time
+import logging
+from selenium.common.exceptions import TimeoutException
+
+logger = logging.getLogger("accessai.browser.readiness")
+
+# Scripts resolve on the browser events themselves instead of sleeping a fixed time
+
+DOM_CONTENT_LOADED_SCRIPT = """
+const done = arguments[arguments.length - 1];
+if (document.readyState !== 'loading') { done(true); }
+else { document.addEventListener('DOMContentLoaded', () => done(true), {once: true}); }
+"""
+
+LOAD_SCRIPT = """
+const done = arguments[arguments.length - 1];
+if (document.readyState === 'complete') { done(true); }
+else { window.addEventListener('load', () => done(true), {once: true}); }
+"""
+
+# Resolves once no new resource has finished loading for idleMs
+NETWORK_IDLE_SCRIPT = """
+const idleMs = arguments[0];
+const done = arguments[arguments.length - 1];
+let timer = setTimeout(() => done(true), idleMs);
+new PerformanceObserver(() => {
+    clearTimeout(timer);
+    timer = setTimeout(() => done(true), idleMs);
+}).observe({type: 'resource', buffered: false});
+"""
+
+FONTS_SCRIPT = """
+const done = arguments[arguments.length - 1];
+if (!document.fonts) { done(true); }
+else { document.fonts.ready.then(() => done(true), () => done(false)); }
+"""
+
+class PageReadiness:
+    """
+    Waits until a loaded page is ready for screenshots
+    strategy: "domcontentloaded", "load" or "networkidle" (load, then no new requests for idle_time)
+    """
+
+    STRATEGIES = ("domcontentloaded", "load", "networkidle")
+
+    def __init__(self, strategy="load", max_wait=10.0, idle_time=0.5, wait_for_fonts=True):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown readiness strategy: {strategy}")
+        self.strategy = strategy
+        self.max_wait = max_wait
+        self.idle_time = idle_time
+        self.wait_for_fonts = wait_for_fonts
+
+    def _run(self, driver, script, deadline, *args):
+        """
+        Run an async readiness script within the remaining budget; False on timeout
+        The driver's script timeout is restored afterwards, since pooled drivers are reused
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        previous = driver.timeouts.script
+        driver.set_script_timeout(remaining)
+        try:
+            return bool(driver.execute_async_script(script, *args))
+        except TimeoutException:
+            return False
+        finally:
+            driver.set_script_timeout(previous)
+
+    def wait(self, driver):
+        """
+        Block until the page is ready or max_wait runs out
+        Returns a report of the strategy used and the time waited
+        """
+        start = time.monotonic()
+        deadline = start + self.max_wait
+
+        if self.strategy == "domcontentloaded":
+            ready = self._run(driver, DOM_CONTENT_LOADED_SCRIPT, deadline)
+        else:
+            ready = self._run(driver, LOAD_SCRIPT, deadline)
+            if ready and self.strategy == "networkidle":
+                ready = self._run(driver, NETWORK_IDLE_SCRIPT, deadline, int(self.idle_time * 1000))
+
+        fonts_loaded = None
+        if self.wait_for_fonts and ready:
+            fonts_loaded = self._run(driver, FONTS_SCRIPT, deadline)
+            ready = fonts_loaded
+
+        report = {
+            "strategy": self.strategy,
+            "waited_ms": round((time.monotonic() - start) * 1000),
+            "timed_out": not ready,
+            "fonts_loaded": fonts_loaded
+        }
+        if not ready:
+            logger.warning(f"Page not ready after {self.max_wait}s ({self.strategy})")
+        return report
@@ -1,45 +1,99 @@
 import io
+import base64
 import numpy as np
 import logging
+import threading
+from contextlib import contextmanager
 from PIL import Image
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-import time
+from core.browser.browser_pool import headless_chrome_options
+from core.browser.page_readiness import PageReadiness
+from core.vision.image_utils import crop_box
 
 logger = logging.getLogger("accessai.browser.screenshot")
 
+# Returns bounding boxes for a list of selectors in page coordinates
+ELEMENT_BOXES_SCRIPT = """
+const [selectors, allMatches] = arguments;
+const toBox = (element) => {
+    const rect = element.getBoundingClientRect();
+    return {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height};
+};
+return selectors.map((selector) => {
+    if (allMatches) { return Array.from(document.querySelectorAll(selector), toBox); }
+    const element = document.querySelector(selector);
+    return element ? toBox(element) : null;
+});
+"""
+
+PAGE_METRICS_SCRIPT = """
+const root = document.documentElement;
+return {
+    width: Math.max(root.scrollWidth, document.body ? document.body.scrollWidth : 0),
+    height: Math.max(root.scrollHeight, document.body ? document.body.scrollHeight : 0),
+    viewportHeight: window.innerHeight,
+    devicePixelRatio: window.devicePixelRatio || 1
+};
+"""
+
 class ScreenshotProcessor:
     """Takes screenshots of web pages and processes them for analysis"""
     
-    def __init__(self):
-        """Initialize the screenshot processor with a headless browser"""
-        # Setting up headless Chrome
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--window-size=1920,1080')
+    def __init__(self, pool=None, readiness=None):
+        """
+        Initialize the screenshot processor
+        With a BrowserPool, pages are loaded in leased browsers; otherwise a dedicated headless browser is launched
+        readiness is the PageReadiness used after each page load
+        """
+        self.pool = pool
+        self.readiness = readiness or PageReadiness()
+        self.driver = None
+        self._local = threading.local()
+        if pool is not None:
+            return
         
+        # Setting up headless Chrome
         try:
-            self.driver = webdriver.Chrome(options=options)
+            self.driver = webdriver.Chrome(options=headless_chrome_options())
             logger.info("Screenshot processor initialized with headless Chrome")
         except Exception as e:
             logger.error(f"Failed to initialize headless Chrome: {str(e)}")
             self.driver = None
     
+    @contextmanager
+    def open_page(self, url):
+        """Load a page and yield the driver showing it"""
+        if self.pool is not None:
+            with self.pool.lease() as driver:
+                self._load(driver, url)
+                yield driver
+            return
+        
+        if not self.driver:
+            raise RuntimeError("Headless browser not available")
+        self._load(self.driver, url)
+        yield self.driver
+    
+    @property
+    def last_readiness(self):
+        """Readiness report of the last page loaded by the calling thread"""
+        return getattr(self._local, "readiness", None)
+    
+    def _load(self, driver, url):
+        driver.get(url)
+        # Waiting for page to be ready
+        self._local.readiness = self.readiness.wait(driver)
+    
     def take_screenshot(self, url):
         """Take a screenshot of a web page"""
-        if not self.driver:
+        if not self.driver and self.pool is None:
             logger.error("Headless browser not available")
             return None
             
         try:
-            self.driver.get(url)
-            # Waiting for page to load
-            time.sleep(2)
-            
-            # Taking screenshot
-            screenshot = self.driver.get_screenshot_as_png()
+            with self.open_page(url) as driver:
+                # Taking screenshot
+                screenshot = driver.get_screenshot_as_png()
             
             # Converting to numpy array
             image = np.array(Image.open(io.BytesIO(screenshot)))
@@ -48,35 +102,93 @@ class ScreenshotProcessor:
             logger.error(f"Failed to take screenshot of {url}: {str(e)}")
             return None
     
-    def get_element_screenshot(self, element_selector):
-        """Get a screenshot of a specific element"""
-        if not self.driver:
-            logger.error("Headless browser not available")
-            return None
-            
+    def get_element_screenshot(self, element_selector, driver=None):
+        """
+        Get a screenshot of a specific element
+        Uses the page loaded in driver (e.g. from open_page), or the dedicated browser's current page
+        """
+        crops = self.get_element_screenshots([element_selector], driver)
+        return crops[0] if crops else None
+    
+    def get_element_boxes(self, selectors, driver=None, all_matches=False):
+        """
+        Bounding boxes of elements in CSS pixels, page coordinates, from one script call
+        Returns a list aligned with selectors: a box dict (or None), or a list of boxes with all_matches
+        """
+        driver = driver or self.driver
+        return driver.execute_script(ELEMENT_BOXES_SCRIPT, list(selectors), all_matches)
+    
+    def capture_full_page(self, driver=None):
+        """
+        Capture the whole scrollable page as one decoded RGB array
+        Returns (image, scale) where scale converts CSS pixels to image pixels (devicePixelRatio)
+        """
+        driver = driver or self.driver
+        metrics = driver.execute_script(PAGE_METRICS_SCRIPT)
+        
         try:
-            element = self.driver.find_element_by_css_selector(element_selector)
-            
-            # Getting element location and size
-            location = element.location
-            size = element.size
-            
-            # Taking screenshot
-            screenshot = self.driver.get_screenshot_as_png()
-            image = Image.open(io.BytesIO(screenshot))
+            # One capture beyond the viewport through CDP
+            capture = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "png",
+                "captureBeyondViewport": True,
+                "clip": {"x": 0, "y": 0, "width": metrics["width"], "height": metrics["height"], "scale": 1}
+            })
+            image = np.asarray(Image.open(io.BytesIO(base64.b64decode(capture["data"]))).convert("RGB"))
+        except Exception as e:
+            logger.info(f"CDP full-page capture unavailable, stitching viewport tiles: {str(e)}")
+            # Tiles are only as wide as the viewport, so the width cannot give the scale here
+            return self._capture_tiles(driver, metrics), metrics["devicePixelRatio"]
+        
+        return image, image.shape[1] / metrics["width"]
+    
+    def _capture_tiles(self, driver, metrics):
+        """
+        Scroll through the page and stitch viewport screenshots into one array, at devicePixelRatio
+        Only the first viewport width is covered; crops beyond it are clipped
+        """
+        scale = metrics["devicePixelRatio"]
+        page = None
+        y = 0
+        while True:
+            scroll_y = driver.execute_script("window.scrollTo(0, arguments[0]); return window.scrollY;", y)
+            tile = np.asarray(Image.open(io.BytesIO(driver.get_screenshot_as_png())).convert("RGB"))
             
-            # Cropping to element
-            left = location['x']
-            top = location['y']
-            right = location['x'] + size['width']
-            bottom = location['y'] + size['height']
+            if page is None:
+                page = np.zeros((int(round(metrics["height"] * scale)), tile.shape[1], 3), dtype=np.uint8)
             
-            image = image.crop((left, top, right, bottom))
+            # The last tile can be clamped by the browser, so placing it at the actual scroll offset
+            top = int(round(scroll_y * scale))
+            rows = min(tile.shape[0], page.shape[0] - top)
+            page[top:top + rows] = tile[:rows]
             
-            return np.array(image)
+            y = scroll_y + metrics["viewportHeight"]
+            if y >= metrics["height"] or top + rows >= page.shape[0]:
+                break
+        
+        driver.execute_script("window.scrollTo(0, 0);")
+        return page
+    
+    def get_element_screenshots(self, selectors, driver=None, all_matches=False):
+        """
+        Crops of many elements from a single full-page capture
+        Crops are NumPy views into one decoded array, so no pixels are copied per element.
+        Returns a list aligned with selectors: an array (or None), or a list of arrays with all_matches
+        """
+        driver = driver or self.driver
+        if not driver:
+            logger.error("Headless browser not available")
+            return None
+        
+        try:
+            boxes = self.get_element_boxes(selectors, driver, all_matches)
+            image, scale = self.capture_full_page(driver)
         except Exception as e:
-            logger.error(f"Failed to get element screenshot: {str(e)}")
+            logger.error(f"Failed to get element screenshots: {str(e)}")
             return None
+        
+        if all_matches:
+            return [[crop_box(image, box, scale) for box in matches] for matches in boxes]
+        return [crop_box(image, box, scale) if box else None for box in boxes]
     
     def cleanup(self):
         """Clean up resources"""
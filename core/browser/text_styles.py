@@ -0,0 +1,93 @@
+import logging
+
+logger = logging.getLogger("accessai.browser.text_styles")
+
+# Defines selectorFor(element): a short CSS path, anchored at the nearest id
+SELECTOR_FUNCTION = """
+const selectorFor = (element) => {
+    const path = [];
+    for (let node = element; node && node.nodeType === 1 && path.length < 5; node = node.parentElement) {
+        if (node.id) { path.unshift('#' + CSS.escape(node.id)); break; }
+        let index = 1;
+        for (let sibling = node.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === node.tagName) { index++; }
+        }
+        path.unshift(node.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+    }
+    return path.join(' > ');
+};
+"""
+
+# Collects computed text styles for every element that directly contains visible text,
+# in one script call. Backgrounds are resolved by compositing semi-transparent ancestors
+# over the canvas; elements over background images or gradients are flagged for pixel analysis.
+TEXT_STYLES_SCRIPT = SELECTOR_FUNCTION + """
+const maxElements = arguments[0];
+
+const parseColor = (value) => {
+    const match = /rgba?\\(([^)]+)\\)/.exec(value || '');
+    if (!match) { return null; }
+    const parts = match[1].split(/[\\s,\\/]+/).filter(Boolean).map(Number);
+    return [parts[0], parts[1], parts[2], parts.length > 3 ? parts[3] : 1];
+};
+
+const blend = (top, bottom) => {
+    const alpha = top[3];
+    return [0, 1, 2].map((i) => top[i] * alpha + bottom[i] * (1 - alpha)).concat([1]);
+};
+
+const resolveBackground = (element) => {
+    const layers = [];
+    let needsPixels = false;
+    for (let node = element; node && node.nodeType === 1; node = node.parentElement) {
+        const style = getComputedStyle(node);
+        if (style.backgroundImage && style.backgroundImage !== 'none') { needsPixels = true; break; }
+        const color = parseColor(style.backgroundColor);
+        if (color === null) { needsPixels = true; break; }
+        if (color[3] > 0) { layers.push(color); }
+        if (color[3] >= 1) { break; }
+    }
+    let background = [255, 255, 255, 1];
+    for (let i = layers.length - 1; i >= 0; i--) { background = blend(layers[i], background); }
+    return {background: background, needsPixels: needsPixels};
+};
+
+const seen = new Set();
+const results = [];
+const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_TEXT);
+while (walker.nextNode() && results.length < maxElements) {
+    const text = walker.currentNode.textContent.trim();
+    const element = walker.currentNode.parentElement;
+    if (!text || !element || seen.has(element)) { continue; }
+    seen.add(element);
+
+    const style = getComputedStyle(element);
+    if (style.visibility === 'hidden' || style.display === 'none' || parseFloat(style.opacity) === 0) { continue; }
+    const rect = element.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) { continue; }
+
+    const resolved = resolveBackground(element);
+    let color = parseColor(style.color);
+    const needsPixels = resolved.needsPixels || color === null;
+    if (color !== null) { color = blend(color, resolved.background); }
+
+    results.push({
+        selector: selectorFor(element),
+        text: text.slice(0, 80),
+        color: color ? color.slice(0, 3) : null,
+        background: resolved.background.slice(0, 3),
+        font_size_px: parseFloat(style.fontSize),
+        font_weight: parseInt(style.fontWeight, 10) || 400,
+        needs_pixels: needsPixels,
+        box: {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height}
+    });
+}
+return results;
+"""
+
+def collect_text_styles(driver, max_elements=5000):
+    """
+    Computed color, resolved background, font size and weight of all text elements on the loaded page
+    Returns a list of dicts; entries with needs_pixels have no reliable background color
+    """
+    return driver.execute_script(TEXT_STYLES_SCRIPT, max_elements)
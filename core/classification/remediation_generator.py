@@ -1,20 +1,212 @@
+import time
 import logging
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+import re
+from core.config import TORCH_THREADS
+from core.nlp.batching import MicroBatcher
+from core.nlp.generation_cache import generation_key, get_default_cache
+from core.nlp.model_registry import model_registry, T5_SMALL
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("accessai.ml")
 
+PROMPT_TEMPLATE = "Suggest how to fix this accessibility issue (WCAG {}): {}"
+
+# Fixes for the issue types the scanner reports most: (wcag_reference, pattern searched in the
+# description and then the selector, template). The first match wins; templates are formatted
+# with the issue's selector and recommendation plus the pattern's named groups
+REMEDIATION_TEMPLATES = [
+    # Image triage appends its classification to the alt text issues it refines
+    ("1.1.1", re.compile(r"image appears informative", re.I),
+     "Give {selector} alt text that conveys what the image shows or does; it looks informative, so it needs a text alternative"),
+    ("1.1.1", re.compile(r"image appears decorative", re.I),
+     'Set alt="" (or role="presentation") on {selector} if it is purely decorative, as it appears to be; otherwise add descriptive alt text'),
+    ("1.1.1", re.compile(r"missing alt text", re.I),
+     'Add an alt attribute to {selector} that describes what the image shows or does, or alt="" if it is purely decorative'),
+    ("1.1.1", re.compile(r"generic or empty alt text", re.I),
+     "Replace the alt text of {selector} with a description of the image's content or function instead of a generic word or file name"),
+    ("1.1.1", re.compile(r"empty alt text", re.I),
+     'Keep alt="" on {selector} only if the image is purely decorative; otherwise replace it with alt text describing what the image shows or does'),
+    ("1.3.1", re.compile(r"missing main heading", re.I),
+     "Add one <h1> at the start of the main content that describes the page"),
+    ("1.3.1", re.compile(r"from h(?P<previous>\d) to h(?P<level>\d)", re.I),
+     "Headings jump from <h{previous}> to <h{level}>; add the missing level or renumber the heading so no level is skipped"),
+    ("1.4.3", re.compile(r"low contrast text \((?P<ratio>[\d.]+):1\)", re.I),
+     "{recommendation} of {selector} (currently {ratio}:1)"),
+    ("2.4.2", re.compile(r"missing page title", re.I),
+     'Add a <title> inside <head> that names the page and site, e.g. "Checkout - Example Store"'),
+    ("2.4.4", re.compile(r"non-descriptive link text", re.I),
+     'Rewrite the text of {selector} to say where the link goes (e.g. "Read the pricing guide" rather than "click here"), or give it an aria-label'),
+    ("2.5.8", re.compile(r"too small \((?P<width>[\d.]+)x(?P<height>[\d.]+)px\)", re.I),
+     "Enlarge {selector} from {width}x{height}px to at least 24x24 CSS pixels with padding or min-width/min-height, or keep 24px between it and neighbouring targets"),
+    ("3.1.1", re.compile(r"missing language attribute", re.I),
+     'Declare the page language on the root element, e.g. <html lang="en">'),
+    ("4.1.2", re.compile(r"missing id attribute", re.I),
+     'Give the input an id and reference it from a <label for="...">, or wrap the input in its <label>'),
+    ("4.1.2", re.compile(r"missing associated label", re.I),
+     'Add a visible <label for="..."> matching the input\'s id; use aria-label only when a visible label is impossible'),
+    # The ARIA rule reports the element's markup in place of a selector
+    ("4.1.2", re.compile(r"aria-label but no role: <(?P<tag>[\w-]+)", re.I),
+     "Give the <{tag}> carrying aria-label a role (e.g. button, link or region), or use an element that has one natively; otherwise the label may be ignored"),
+    ("4.1.2", re.compile(r"invalid aria-hidden value: <(?P<tag>[\w-]+)", re.I),
+     'Set aria-hidden on the <{tag}> to "true" or "false", or remove the attribute'),
+]
+
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_WHITESPACE = re.compile(r"\s+")
+
+def _field(issue, name):
+    """Field of an AccessibilityIssue or issue dict"""
+    value = issue.get(name) if isinstance(issue, dict) else getattr(issue, name, None)
+    return value or ""
+
+def normalize_snippet(text):
+    """
+    Issue text with attribute values and numbers masked, so issues that differ only in
+    the element they point at share one remediation
+    """
+    text = _QUOTED.sub('""', text)
+    text = _NUMBER.sub("#", text)
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
 class RemediationGenerator:
     """Generates specific remediation suggestions for accessibility issues"""
     
-    def __init__(self):
-        """Initialize the remediation generator"""
-        try:
-            # Load models
-            self.tokenizer = AutoTokenizer.from_pretrained("t5-small")
-            self.model = AutoModelForSeq2SeqLM.from_pretrained("t5-small")
-            logger.info("Remediation generator initialized with T5 model")
-        except Exception as e:
-            logger.error(f"Failed to load remediation models: {str(e)}")
-            self.tokenizer = None
-            self.model = None
\ No newline at end of file
+    # Passed to model.generate and part of every cache key
+    GENERATION_PARAMS = {"max_length": 64, "num_beams": 2, "early_stopping": True}
+    
+    def __init__(self, model_name=T5_SMALL, batch_size=16, max_wait_ms=20, cache=None,
+                 timeout=60, torch_threads=None):
+        """
+        Initialize the remediation generator
+        The T5 model is loaded from the shared registry on first use. Issues without a
+        template are generated in batches of up to batch_size prompts and memoized in
+        cache (default: the shared GenerationCache, opened the first time the model is needed).
+        Generations still pending after timeout seconds keep their static recommendation;
+        torch_threads defaults to ACCESSAI_TORCH_THREADS, as for the alt text generator.
+        """
+        self.model_name = model_name
+        self.timeout = timeout
+        self.torch_threads = torch_threads or TORCH_THREADS or None
+        self._cache = cache
+        self.batcher = MicroBatcher(
+            self._generate_batch,
+            max_batch_size=batch_size,
+            max_wait_ms=max_wait_ms,
+            name="remediation"
+        )
+    
+    @property
+    def tokenizer(self):
+        loaded = model_registry.get(self.model_name)
+        return loaded.tokenizer if loaded else None
+    
+    @property
+    def model(self):
+        loaded = model_registry.get(self.model_name)
+        return loaded.model if loaded else None
+    
+    def template_remediation(self, issue):
+        """The templated fix for an issue, or None when no template matches"""
+        wcag_reference = _field(issue, "wcag_reference")
+        description = _field(issue, "description")
+        selector = _field(issue, "element_selector")
+        for reference, pattern, template in REMEDIATION_TEMPLATES:
+            if reference != wcag_reference:
+                continue
+            match = pattern.search(description) or pattern.search(selector)
+            if match:
+                return template.format(
+                    selector=selector or "the element",
+                    recommendation=_field(issue, "recommendation").rstrip("."),
+                    **match.groupdict()
+                )
+        return None
+    
+    def generate_remediations(self, issues, use_model=True, report=None):
+        """
+        Remediation text for each issue, in order
+        Issues matching a template are answered immediately. The rest are grouped on
+        (wcag_reference, normalized description and selector) and each group is generated
+        once, in batched model calls. Issues without a WCAG reference, or whose generation
+        fails, keep their current recommendation; use_model=False skips generation entirely.
+        """
+        remediations = [None] * len(issues)
+        groups = {}
+        for i, issue in enumerate(issues):
+            remediation = self.template_remediation(issue)
+            if remediation is not None:
+                remediations[i] = remediation
+                continue
+            wcag_reference = _field(issue, "wcag_reference")
+            if not use_model or not wcag_reference:
+                continue
+            snippet = normalize_snippet(f"{_field(issue, 'description')} {_field(issue, 'element_selector')}")
+            groups.setdefault((wcag_reference, snippet), []).append(i)
+        
+        templated = sum(remediation is not None for remediation in remediations)
+        generated = self._generate_groups(list(groups)) if groups else {}
+        for group, indices in groups.items():
+            for i in indices:
+                remediations[i] = generated.get(group)
+        
+        for i, issue in enumerate(issues):
+            if not remediations[i]:
+                remediations[i] = _field(issue, "recommendation")
+        
+        if report is not None:
+            report["remediations_templated"] = templated
+            report["remediations_generated"] = sum(len(groups[group]) for group in generated)
+            report["remediation_prompts"] = len(groups)
+        return remediations
+    
+    def _generate_groups(self, groups):
+        """Generated text per (wcag_reference, snippet) group, served from the cache where possible"""
+        params = dict(self.GENERATION_PARAMS, prompt=PROMPT_TEMPLATE)
+        cache = self._cache if self._cache is not None else get_default_cache()
+        
+        results = {}
+        futures = {}
+        for wcag_reference, snippet in groups:
+            prompt = PROMPT_TEMPLATE.format(wcag_reference, snippet)
+            key = generation_key(prompt, self.model_name, params)
+            cached = cache.get(key) if cache else None
+            if cached is not None:
+                results[(wcag_reference, snippet)] = cached
+            else:
+                futures[(wcag_reference, snippet)] = (key, self.batcher.submit(prompt))
+        
+        # One deadline for the whole call, so a stuck batcher cannot hold the scan for long
+        deadline = time.monotonic() + self.timeout
+        for group, (key, future) in futures.items():
+            try:
+                remediation = future.result(timeout=max(0, deadline - time.monotonic()))
+            except Exception as e:
+                logger.error(f"Failed to generate remediation: {str(e) or type(e).__name__}")
+                continue
+            if not remediation:
+                continue
+            results[group] = remediation
+            if cache:
+                cache.set(key, remediation)
+        return results
+    
+    def _generate_batch(self, prompts):
+        """Run one padded generate call for a batch of prompts; None for each when the model is unavailable"""
+        loaded = model_registry.get(self.model_name)
+        if loaded is None:
+            return [None] * len(prompts)
+        tokenizer, model = loaded.tokenizer, loaded.model
+        
+        import torch
+        if self.torch_threads and torch.get_num_threads() != self.torch_threads:
+            torch.set_num_threads(self.torch_threads)
+        
+        inputs = tokenizer(prompts, return_tensors="pt", max_length=256, truncation=True, padding=True)
+        with torch.no_grad():
+            outputs = model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                **self.GENERATION_PARAMS
+            )
+        return [text.strip() for text in tokenizer.batch_decode(outputs, skip_special_tokens=True)]
@@ -0,0 +1,30 @@
+import os
+
+# Runtime settings of the core components, overridable through environment variables
+
+def env_int(name, default):
+    """Integer setting from an environment variable; unset, empty or malformed values give default"""
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+# Warm headless browser pool for screenshots; browsers are recycled after MAX_PAGES pages
+# or once they use more than MAX_MEMORY_MB
+BROWSER_POOL_SIZE = env_int("ACCESSAI_BROWSER_POOL_SIZE", 2)
+BROWSER_MAX_PAGES = env_int("ACCESSAI_BROWSER_MAX_PAGES", 100)
+BROWSER_MAX_MEMORY_MB = env_int("ACCESSAI_BROWSER_MAX_MEMORY_MB", 1024)
+
+# Loaded NLP models are evicted, least recently used first, above this many MB of weights
+MODEL_MEMORY_MB = env_int("ACCESSAI_MODEL_MEMORY_MB", 2048)
+
+# torch intra-op threads for generation (0 keeps torch's own default)
+TORCH_THREADS = env_int("ACCESSAI_TORCH_THREADS", 0)
+
+# Cache of generated texts: "disk", "memory" or "none"
+ALT_TEXT_CACHE = os.environ.get("ACCESSAI_ALT_TEXT_CACHE", "disk")
+ALT_TEXT_CACHE_PATH = os.environ.get("ACCESSAI_ALT_TEXT_CACHE_PATH", "accessai-alt-text.db")
+ALT_TEXT_CACHE_ENTRIES = env_int("ACCESSAI_ALT_TEXT_CACHE_ENTRIES", 4096)
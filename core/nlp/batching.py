@@ -0,0 +1,150 @@
+import time
+import bisect
+import logging
+import threading
+from collections import deque, defaultdict
+from concurrent.futures import Future
+
+logger = logging.getLogger("accessai.nlp.batching")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class MicroBatcher:
+    """
+    Groups concurrent requests into batches for one model call
+    Items are queued by length bucket (length_fn(item) // bucket_width) so a batch pads to
+    similar lengths. A bucket is dispatched once it holds max_batch_size items or its oldest
+    item has waited max_wait_ms. num_threads dispatcher threads run process_batch, which takes
+    a list of items and returns a list of results in the same order.
+    """
+
+    def __init__(self, process_batch, max_batch_size=8, max_wait_ms=20, bucket_width=64,
+                 length_fn=len, num_threads=1, name="batcher"):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.bucket_width = bucket_width
+        self.length_fn = length_fn
+        self.num_threads = num_threads
+        self.name = name
+
+        self._buckets = defaultdict(deque)
+        self._condition = threading.Condition()
+        self._threads = []
+        self._closed = False
+
+        # Metrics
+        self._batch_sizes = defaultdict(int)
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._items_done = 0
+        self._busy_seconds = 0.0
+        self._started_at = None
+
+    def _start(self):
+        """Start the dispatcher threads on first use; called with the condition held"""
+        if self._threads:
+            return
+        self._started_at = time.monotonic()
+        for i in range(self.num_threads):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, item):
+        """Queue one item; returns a Future resolving to its result"""
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            self._start()
+            bucket = self.length_fn(item) // self.bucket_width
+            self._buckets[bucket].append((item, future, time.monotonic()))
+            self._condition.notify()
+        return future
+
+    def map(self, items, timeout=None):
+        """Submit many items and wait for all of their results, in order"""
+        futures = [self.submit(item) for item in items]
+        return [future.result(timeout) for future in futures]
+
+    def _next_batch(self):
+        """
+        Wait for a bucket that is full or past its deadline and take a batch from it
+        Returns None once closed and drained
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                ready = None
+                earliest = None
+                for queued in self._buckets.values():
+                    if not queued:
+                        continue
+                    deadline = queued[0][2] + self.max_wait
+                    if len(queued) >= self.max_batch_size or deadline <= now or self._closed:
+                        # Serving the bucket that has waited longest first
+                        if ready is None or queued[0][2] < ready[0][2]:
+                            ready = queued
+                    else:
+                        earliest = deadline if earliest is None else min(earliest, deadline)
+
+                if ready is not None:
+                    return [ready.popleft() for _ in range(min(self.max_batch_size, len(ready)))]
+                if self._closed:
+                    return None
+                self._condition.wait(None if earliest is None else earliest - now)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            started = time.monotonic()
+            try:
+                results = self.process_batch([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"Batch of {len(batch)} items returned {len(results)} results")
+            except Exception as e:
+                logger.error(f"{self.name} batch failed: {str(e)}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                results = None
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+
+            finished = time.monotonic()
+            with self._condition:
+                self._batch_sizes[len(batch)] += 1
+                self._busy_seconds += finished - started
+                if results is not None:
+                    self._items_done += len(batch)
+                for _, _, queued_at in batch:
+                    latency_ms = (finished - queued_at) * 1000
+                    self._latency_counts[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def stats(self):
+        """Batch size and latency histograms with throughput figures"""
+        with self._condition:
+            elapsed = time.monotonic() - self._started_at if self._started_at else 0
+            labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+            return {
+                "queued": sum(len(queued) for queued in self._buckets.values()),
+                "batches": sum(self._batch_sizes.values()),
+                "items": self._items_done,
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "latency_ms_histogram": dict(zip(labels, self._latency_counts)),
+                "items_per_second": round(self._items_done / elapsed, 2) if elapsed else 0.0,
+                "items_per_busy_second": round(self._items_done / self._busy_seconds, 2) if self._busy_seconds else 0.0
+            }
+
+    def close(self, wait=True):
+        """Stop accepting items; queued items are still processed"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
@@ -0,0 +1,151 @@
+import json
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from core.config import ALT_TEXT_CACHE, ALT_TEXT_CACHE_ENTRIES, ALT_TEXT_CACHE_PATH
+
+logger = logging.getLogger("accessai.nlp.cache")
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text):
+    """Unicode-normalized, lowercased text with whitespace runs collapsed"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().lower()
+
+def generation_key(text, model_id, params):
+    """Cache key for generating from text with a model and its generation parameters"""
+    payload = json.dumps([model_id, params, normalize_text(text)], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class GenerationCache:
+    """
+    Generated texts keyed by generation_key, in an in-memory LRU backed by an optional SQLite file
+    Memory misses fall through to disk and are promoted on a hit; the file is trimmed to the
+    disk_max_entries most recently used entries every 100 writes.
+    """
+
+    def __init__(self, path=None, max_entries=4096, disk_max_entries=100000):
+        self.path = path
+        self.max_entries = max_entries
+        self.disk_max_entries = disk_max_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._local = threading.local()
+        if path:
+            self._connect().execute(
+                "CREATE TABLE IF NOT EXISTS generations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connect().execute("CREATE INDEX IF NOT EXISTS idx_generations_last_used ON generations(last_used)")
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _remember(self, key, value):
+        """Insert into the memory tier; called with the lock held"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """The cached text for key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+
+        value = None
+        if self.path:
+            try:
+                connection = self._connect()
+                row = connection.execute("SELECT value FROM generations WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = row[0]
+                    connection.execute("UPDATE generations SET last_used = ? WHERE key = ?", (time.time(), key))
+            except sqlite3.Error as e:
+                logger.warning(f"Generation cache read failed: {str(e)}")
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, value)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            self._writes += 1
+            trim = self._writes % 100 == 0
+        if not self.path:
+            return
+
+        try:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO generations (key, value, last_used) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            if trim:
+                connection.execute(
+                    "DELETE FROM generations WHERE key IN ("
+                    "SELECT key FROM generations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_max_entries,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Generation cache write failed: {str(e)}")
+
+    def stats(self):
+        """Hit counts per tier and the overall hit rate"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._entries),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+            }
+
+def create_generation_cache(backend=None, path=None):
+    """
+    Build the cache selected by ACCESSAI_ALT_TEXT_CACHE ("disk", "memory" or "none")
+    and ACCESSAI_ALT_TEXT_CACHE_PATH; returns None when caching is disabled
+    """
+    backend = backend or ALT_TEXT_CACHE
+    max_entries = ALT_TEXT_CACHE_ENTRIES
+    if backend == "memory":
+        return GenerationCache(max_entries=max_entries)
+    if backend == "disk":
+        path = path or ALT_TEXT_CACHE_PATH
+        return GenerationCache(path, max_entries=max_entries)
+    return None
+
+# Process-wide cache, created on first use
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache():
+    """Shared cache built by create_generation_cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = create_generation_cache() or False
+        return _default_cache or None
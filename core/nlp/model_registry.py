@@ -0,0 +1,146 @@
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from core.config import MODEL_MEMORY_MB
+
+logger = logging.getLogger("accessai.nlp.models")
+
+# Checkpoints used by the NLP components
+DISTILBERT = "distilbert-base-uncased"
+T5_BASE = "t5-base"
+T5_SMALL = "t5-small"
+
+LoadedModel = namedtuple("LoadedModel", ["tokenizer", "model"])
+
+def transformers_loader(auto_class_name, checkpoint):
+    """Loader for a tokenizer and model in eval mode; transformers is imported on first load"""
+    def load():
+        import transformers
+        model = getattr(transformers, auto_class_name).from_pretrained(checkpoint)
+        model.eval()
+        return LoadedModel(transformers.AutoTokenizer.from_pretrained(checkpoint), model)
+    return load
+
+def seq2seq_loader(checkpoint):
+    """Loader for a tokenizer and sequence-to-sequence model"""
+    return transformers_loader("AutoModelForSeq2SeqLM", checkpoint)
+
+def sequence_classification_loader(checkpoint):
+    """Loader for a tokenizer and sequence classification model"""
+    return transformers_loader("AutoModelForSequenceClassification", checkpoint)
+
+def _tensor_bytes(value):
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(item) for item in value)
+    if hasattr(value, "numel") and hasattr(value, "element_size"):
+        return value.numel() * value.element_size()
+    return 0
+
+def model_memory_mb(model):
+    """Size of a model's weights in MB, measured from its state dict; 0 when it is not a torch module"""
+    if not hasattr(model, "state_dict"):
+        return 0
+    return sum(_tensor_bytes(value) for value in model.state_dict().values()) / (1024 * 1024)
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models, shared by every component that uses them
+    Models are loaded on first use. When the loaded models exceed max_memory_mb, the least
+    recently used ones are dropped; callers still holding one keep it alive until they finish.
+    A model that failed to load is not retried until it is unloaded.
+    """
+
+    def __init__(self, max_memory_mb=2048):
+        self.max_memory_mb = max_memory_mb
+        self._loaders = {}
+        self._loaded = OrderedDict()
+        self._sizes = {}
+        self._failed = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def register(self, name, loader):
+        """Register a loader returning a LoadedModel for name"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._load_locks.setdefault(name, threading.Lock())
+
+    def get(self, name):
+        """
+        The LoadedModel for name, loading it if needed
+        Returns None when the model cannot be loaded
+        """
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                return self._loaded[name]
+            if name in self._failed:
+                return None
+            if name not in self._loaders:
+                raise KeyError(f"Unknown model: {name}")
+            load_lock = self._load_locks[name]
+
+        # Loading outside the registry lock, once per model even with concurrent callers
+        with load_lock:
+            with self._lock:
+                if name in self._loaded:
+                    return self._loaded[name]
+                if name in self._failed:
+                    return None
+            try:
+                loaded = self._loaders[name]()
+            except Exception as e:
+                logger.error(f"Failed to load model {name}: {str(e)}")
+                with self._lock:
+                    self._failed[name] = str(e)
+                return None
+
+            size = model_memory_mb(loaded.model)
+            logger.info(f"Loaded model {name} ({size:.0f} MB)")
+            with self._lock:
+                self._loaded[name] = loaded
+                self._sizes[name] = size
+                self._evict(keep=name)
+            return loaded
+
+    def _evict(self, keep):
+        """Drop least recently used models until the memory limit holds; called with the lock held"""
+        while sum(self._sizes.values()) > self.max_memory_mb:
+            name = next((candidate for candidate in self._loaded if candidate != keep), None)
+            if name is None:
+                break
+            logger.info(f"Unloading model {name} to stay within {self.max_memory_mb} MB")
+            del self._loaded[name]
+            del self._sizes[name]
+
+    def unload(self, name):
+        """Drop a model (and any recorded load failure) so the next use loads it again"""
+        with self._lock:
+            self._loaded.pop(name, None)
+            self._sizes.pop(name, None)
+            self._failed.pop(name, None)
+
+    def warmup(self, names=None):
+        """
+        Load models up front, e.g. at application startup; defaults to every registered model
+        Unknown names are logged and skipped
+        """
+        for name in names or list(self._loaders):
+            if name not in self._loaders:
+                logger.warning(f"Skipping warmup of unknown model: {name}")
+                continue
+            self.get(name)
+
+    def stats(self):
+        """Loaded models with their sizes, and models that failed to load"""
+        with self._lock:
+            return {
+                "max_memory_mb": self.max_memory_mb,
+                "loaded": {name: round(self._sizes[name], 1) for name in self._loaded},
+                "failed": dict(self._failed)
+            }
+
+model_registry = ModelRegistry(max_memory_mb=MODEL_MEMORY_MB)
+model_registry.register(DISTILBERT, sequence_classification_loader(DISTILBERT))
+model_registry.register(T5_BASE, seq2seq_loader(T5_BASE))
+model_registry.register(T5_SMALL, seq2seq_loader(T5_SMALL))
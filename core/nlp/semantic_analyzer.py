@@ -1,29 +1,61 @@
 import re
 import logging
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from functools import lru_cache
+import numpy as np
+from core.nlp.model_registry import model_registry, DISTILBERT
 
 logger = logging.getLogger("accessai.nlp.semantic")
 
+# One match per sentence: a run between terminators holding more than whitespace
+_SENTENCE = re.compile(r'[^.!?]*?[^.!?\s][^.!?]*')
+_WORD = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+_VOWEL_GROUP = re.compile(r'[aeiouy]+')
+# Simplified passive voice check
+_PASSIVE = re.compile(r'\b(am|is|are|was|were|be|being|been)\s+(\w+ed|written|done|made|said|known)\b')
+
+# Flesch-Kincaid grade above which text needs more than lower secondary education (WCAG 3.1.5)
+MAX_READING_GRADE = 9
+
+@lru_cache(maxsize=200000)
+def count_syllables(word):
+    """
+    Estimated syllables in an English word: vowel groups, less a silent final e or -es/-ed
+    Memoized, so each distinct word in a corpus is counted once
+    """
+    word = word.lower()
+    count = len(_VOWEL_GROUP.findall(word))
+    if count > 1:
+        if word.endswith("e") and not word.endswith(("le", "ee", "ye")):
+            count -= 1
+        elif word.endswith(("es", "ed")) and not word.endswith(("ted", "ded", "ces", "ges", "ses", "zes", "xes", "shes", "ches")):
+            count -= 1
+    return max(1, count)
+
 class SemanticAnalyzer:
     """Analyzes text content for semantic accessibility issues"""
     
-    def __init__(self):
-        """Initialize the semantic analyzer with required models"""
-        try:
-            # Loading readability assessment model
-            self.tokenizer = AutoTokenizer.from_pretrained("distilbert-base-uncased")
-            # use fine-tuned model for readability scoring
-            self.model = AutoModelForSequenceClassification.from_pretrained("distilbert-base-uncased")
-            logger.info("Semantic analyzer initialized with DistilBERT model")
-        except Exception as e:
-            logger.error(f"Failed to load semantic analysis models: {str(e)}")
-            self.tokenizer = None
-            self.model = None
+    def __init__(self, model_name=DISTILBERT):
+        """
+        Initialize the semantic analyzer
+        The readability model is loaded from the shared registry on first use
+        """
+        self.model_name = model_name
+    
+    @property
+    def tokenizer(self):
+        loaded = model_registry.get(self.model_name)
+        return loaded.tokenizer if loaded else None
+    
+    @property
+    def model(self):
+        # use fine-tuned model for readability scoring
+        loaded = model_registry.get(self.model_name)
+        return loaded.model if loaded else None
     
     def analyze_readability(self, text):
         """
         Analyze text readability
-        Returns a readability score and improvement suggestions
+        Returns a readability score (Flesch reading ease, clipped to 0-100) and improvement suggestions
         """
         if not text:
             return {
@@ -31,50 +63,97 @@ class SemanticAnalyzer:
                 "suggestions": ["No text provided for analysis"]
             }
         
-        # using simple rule-based metric
-        
-        # Calculating average sentence length
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        if not sentences:
+        # Same Flesch reading ease scale as analyze_readability_batch
+        result = self.analyze_readability_batch([text])["blocks"][0]
+        if result["metrics"] is None or not result["metrics"]["sentences"]:
             return {
                 "score": 0,
                 "suggestions": ["Text contains no complete sentences"]
             }
-            
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
+        return result
+    
+    def analyze_readability_batch(self, blocks, pages=None):
+        """
+        Flesch reading ease and Flesch-Kincaid grade for many text blocks, e.g. every paragraph of a crawl
+        pages optionally gives each block's page (such as its URL) for per-page aggregates.
+        Returns {"blocks": [...], "summary": {...}, "pages": {page: {...}}}; aggregates are
+        computed over the pooled words and sentences, so long blocks weigh more
+        """
+        blocks = [block or "" for block in blocks]
+        count = len(blocks)
+        if pages is not None and len(pages) != count:
+            raise ValueError(f"pages has {len(pages)} entries for {count} blocks")
+        
+        sentences = np.fromiter((len(_SENTENCE.findall(block)) for block in blocks), dtype=np.int64, count=count)
+        passive = np.fromiter((len(_PASSIVE.findall(block)) for block in blocks), dtype=np.int64, count=count)
+        block_words = [_WORD.findall(block) for block in blocks]
+        words = np.fromiter((len(found) for found in block_words), dtype=np.int64, count=count)
         
-        # Calculating average word length
-        words = text.split()
-        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
+        # Syllables and letters per word over the whole batch, summed back per block
+        flat = [word for found in block_words for word in found]
+        word_syllables = np.fromiter((count_syllables(word) for word in flat), dtype=np.int64, count=len(flat))
+        word_letters = np.fromiter((len(word) for word in flat), dtype=np.int64, count=len(flat))
+        block_index = np.repeat(np.arange(count), words)
+        syllables = np.bincount(block_index, weights=word_syllables, minlength=count)
+        letters = np.bincount(block_index, weights=word_letters, minlength=count)
+        polysyllables = np.bincount(block_index, weights=word_syllables >= 3, minlength=count)
         
-        # Simple readability score (lower is easier to read)
-        # simplified version of metrics like Flesch-Kincaid
-        readability_score = (0.39 * avg_sentence_length) + (11.8 * avg_word_length) - 15.59
+        totals = np.stack([sentences, words, syllables, letters, polysyllables, passive], axis=1)
+        results = [self._readability_metrics(*row) for row in totals.tolist()]
         
-        # Normalizing to 0-100 scale (100 is most readable)
-        normalized_score = max(0, min(100, 100 - readability_score * 2))
+        page_results = {}
+        if pages is not None:
+            page_keys, page_index = np.unique(np.asarray(pages, dtype=object).astype(str), return_inverse=True)
+            page_totals = np.zeros((len(page_keys), totals.shape[1]))
+            np.add.at(page_totals, page_index, totals)
+            difficult = np.bincount(page_index, weights=[
+                result["metrics"] is not None and result["metrics"]["flesch_kincaid_grade"] > MAX_READING_GRADE
+                for result in results
+            ], minlength=len(page_keys))
+            block_counts = np.bincount(page_index, minlength=len(page_keys))
+            for key, row, hard, blocks_on_page in zip(page_keys.tolist(), page_totals.tolist(), difficult.tolist(), block_counts.tolist()):
+                page_results[key] = dict(self._readability_metrics(*row), blocks=blocks_on_page, difficult_blocks=int(hard))
+        
+        return {
+            "blocks": results,
+            "summary": dict(self._readability_metrics(*totals.sum(axis=0).tolist()), blocks=count),
+            "pages": page_results
+        }
+    
+    def _readability_metrics(self, sentences, words, syllables, letters, polysyllables, passive):
+        """Score, metrics and suggestions from a block's (or page's) counts"""
+        if not words:
+            return {"score": 0, "metrics": None, "suggestions": ["No text provided for analysis"]}
+        sentences = max(sentences, 1)
+        
+        words_per_sentence = words / sentences
+        syllables_per_word = syllables / words
+        reading_ease = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+        avg_word_length = letters / words
         
-        # Generating suggestions
         suggestions = []
-        if avg_sentence_length > 20:
+        if words_per_sentence > 20:
             suggestions.append("Consider using shorter sentences to improve readability")
-        
-        if avg_word_length > 5.5:
+        if avg_word_length > 5.5 or syllables_per_word > 1.7:
             suggestions.append("Use simpler, shorter words where possible")
-        
-        # Checking for passive voice (simplified check)
-        passive_pattern = r'\b(am|is|are|was|were|be|being|been)\s+(\w+ed|written|done|made|said|known)\b'
-        passive_count = len(re.findall(passive_pattern, text))
-        if passive_count > len(sentences) * 0.3:
+        if passive > sentences * 0.3:
             suggestions.append("Reduce use of passive voice for clearer communication")
+        if grade > MAX_READING_GRADE:
+            suggestions.append("Text requires more than a lower secondary reading level; simplify it or add a plain-language summary")
         
         return {
-            "score": round(normalized_score, 1),
+            "score": round(max(0, min(100, reading_ease)), 1),
             "metrics": {
-                "avg_sentence_length": round(avg_sentence_length, 1),
+                "flesch_reading_ease": round(reading_ease, 1),
+                "flesch_kincaid_grade": round(grade, 1),
+                "sentences": int(sentences),
+                "words": int(words),
+                "syllables": int(syllables),
+                "polysyllabic_words": int(polysyllables),
+                "avg_sentence_length": round(words_per_sentence, 1),
                 "avg_word_length": round(avg_word_length, 1),
-                "passive_voice_instances": passive_count
+                "passive_voice_instances": int(passive)
             },
             "suggestions": suggestions
         }
@@ -1,57 +1,126 @@
-import torch
 import logging
 import re
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from core.config import TORCH_THREADS
+from core.nlp.batching import MicroBatcher
+from core.nlp.generation_cache import generation_key, get_default_cache
+from core.nlp.model_registry import model_registry, T5_BASE
 
 logger = logging.getLogger("accessai.nlp.text_alt")
 
+PROMPT_TEMPLATE = "Generate accessible alt text for an image described as: {}"
+
 class TextAlternativeGenerator:
     """Generates and evaluates text alternatives for non-text content"""
     
-    def __init__(self, model_path=None):
-        """Initialize with pre-trained models"""
-        try:
-            # Loading models
-            self.tokenizer = AutoTokenizer.from_pretrained("t5-base")
-            self.model = AutoModelForSeq2SeqLM.from_pretrained("t5-base")
-            logger.info("Text alternative generator initialized with T5 model")
-        except Exception as e:
-            logger.error(f"Failed to load text alternative models: {str(e)}")
-            self.tokenizer = None
-            self.model = None
+    # Passed to model.generate and part of every cache key
+    GENERATION_PARAMS = {"max_length": 50, "num_beams": 4, "early_stopping": True}
+    
+    def __init__(self, model_path=None, model_name=T5_BASE, batch_size=8, max_wait_ms=20,
+                 batch_threads=1, torch_threads=None, cache=None):
+        """
+        Initialize the generator
+        The T5 model is loaded from the shared registry on first use. Concurrent
+        generate_alt_text calls are grouped into batches of up to batch_size prompts,
+        waiting at most max_wait_ms; batch_threads batches run at once, and torch_threads
+        (default ACCESSAI_TORCH_THREADS, else torch's own default) sets torch's intra-op threads.
+        Results are memoized in cache (default: the shared GenerationCache, see ACCESSAI_ALT_TEXT_CACHE).
+        """
+        self.model_name = model_name
+        self.cache = cache if cache is not None else get_default_cache()
+        self.torch_threads = torch_threads or TORCH_THREADS or None
+        self.batcher = MicroBatcher(
+            self._generate_batch,
+            max_batch_size=batch_size,
+            max_wait_ms=max_wait_ms,
+            num_threads=batch_threads,
+            name="alt-text"
+        )
+    
+    @property
+    def tokenizer(self):
+        loaded = model_registry.get(self.model_name)
+        return loaded.tokenizer if loaded else None
+    
+    @property
+    def model(self):
+        loaded = model_registry.get(self.model_name)
+        return loaded.model if loaded else None
     
     def generate_alt_text(self, image_description):
         """
         Generate alternative text based on image description
         In a full implementation, this would use a multimodal model that takes the image directly
+        Calls from concurrent threads share batched model calls
+        """
+        return self.generate_alt_text_batch([image_description])[0]
+    
+    def generate_alt_text_batch(self, image_descriptions):
         """
-        if not self.tokenizer or not self.model:
-            return "Unable to generate alternative text"
-            
-        try:
-            # using a text-to-text approach
-            prompt = f"Generate accessible alt text for an image described as: {image_description}"
-            
-            inputs = self.tokenizer(prompt, return_tensors="pt", max_length=512, truncation=True)
-            
-            # Generating alt text
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs["input_ids"],
-                    max_length=50,
-                    num_beams=4,
-                    early_stopping=True
-                )
-                
-            alt_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
-            # Removing common prefixes in generated text
-            alt_text = re.sub(r'^(Alt text:|Alternative text:|Image shows|Image of|Image description:)\s*', '', alt_text)
-            
-            return alt_text
-        except Exception as e:
-            logger.error(f"Failed to generate alt text: {str(e)}")
-            return "Error generating alternative text"
+        Generate alternative text for many image descriptions, in batched model calls
+        Descriptions seen before (after normalization) are served from the cache, and
+        duplicates are generated once. Returns one string per description, in order
+        """
+        params = dict(self.GENERATION_PARAMS, prompt=PROMPT_TEMPLATE)
+        keys = [generation_key(description, self.model_name, params) for description in image_descriptions]
+        
+        results = {}
+        futures = {}
+        for key, description in zip(keys, image_descriptions):
+            if key in results or key in futures:
+                continue
+            cached = self.cache.get(key) if self.cache else None
+            if cached is not None:
+                results[key] = cached
+            else:
+                futures[key] = self.batcher.submit(description)
+        
+        for key, future in futures.items():
+            try:
+                alt_text = future.result()
+            except Exception as e:
+                logger.error(f"Failed to generate alt text: {str(e)}")
+                results[key] = "Error generating alternative text"
+                continue
+            if alt_text is None:
+                results[key] = "Unable to generate alternative text"
+                continue
+            results[key] = alt_text
+            if self.cache:
+                self.cache.set(key, alt_text)
+        
+        return [results[key] for key in keys]
+    
+    def _generate_batch(self, image_descriptions):
+        """Run one padded generate call for a batch of descriptions; None for each when the model is unavailable"""
+        loaded = model_registry.get(self.model_name)
+        if loaded is None:
+            return [None] * len(image_descriptions)
+        tokenizer, model = loaded.tokenizer, loaded.model
+        
+        import torch
+        if self.torch_threads and torch.get_num_threads() != self.torch_threads:
+            torch.set_num_threads(self.torch_threads)
+        
+        # using a text-to-text approach
+        prompts = [PROMPT_TEMPLATE.format(description) for description in image_descriptions]
+        
+        inputs = tokenizer(prompts, return_tensors="pt", max_length=512, truncation=True, padding=True)
+        
+        # Generating alt text
+        with torch.no_grad():
+            outputs = model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                **self.GENERATION_PARAMS
+            )
+        
+        alt_texts = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        
+        # Removing common prefixes in generated text
+        return [
+            re.sub(r'^(Alt text:|Alternative text:|Image shows|Image of|Image description:)\s*', '', alt_text)
+            for alt_text in alt_texts
+        ]
     
     def evaluate_alt_text(self, alt_text):
         """
@@ -1,9 +1,13 @@
 import numpy as np
 import logging
-from sklearn.cluster import KMeans
 
 logger = logging.getLogger("accessai.vision.contrast")
 
+# sRGB channel value (0-255) to linear light, precomputed once for batch lookups
+_CHANNEL = np.arange(256) / 255
+SRGB_TO_LINEAR = np.where(_CHANNEL <= 0.03928, _CHANNEL / 12.92, ((_CHANNEL + 0.055) / 1.055) ** 2.4)
+LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])
+
 class ContrastAnalyzer:
     """Analyzes color contrast between text and background"""
     
@@ -14,6 +18,10 @@ class ContrastAnalyzer:
         self.MIN_CONTRAST_LARGE = 3.0   # For large text (>= 18pt or bold >= 14pt)
         self.MIN_CONTRAST_UI = 3.0      # For UI components
         
+        # Large text in CSS pixels: 18pt, or 14pt when bold
+        self.LARGE_TEXT_PX = 24.0
+        self.LARGE_BOLD_TEXT_PX = 18.66
+        
     def _rgb_to_luminance(self, color):
         """
         Converts RGB color to relative luminance
@@ -45,10 +53,87 @@ class ContrastAnalyzer:
         # Calculating contrast ratio
         return (l1 + 0.05) / (l2 + 0.05)
     
-    def extract_dominant_colors(self, image_data, n_colors=2):
+    def luminance_batch(self, colors):
+        """
+        Relative luminance of many colors at once
+        colors: (N, 3) array-like of 0-255 RGB values; returns an (N,) array
+        """
+        channels = np.clip(np.rint(np.asarray(colors)), 0, 255).astype(np.intp)
+        return SRGB_TO_LINEAR[channels] @ LUMINANCE_WEIGHTS
+    
+    def contrast_ratio_batch(self, foregrounds, backgrounds):
+        """
+        Contrast ratios of N foreground/background pairs, each an (N, 3) array-like
+        """
+        l1 = self.luminance_batch(foregrounds)
+        l2 = self.luminance_batch(backgrounds)
+        return (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+    
+    def evaluate_contrast_batch(self, foregrounds, backgrounds, large_text=None):
+        """
+        Evaluates N color pairs against the WCAG thresholds in one call
+        large_text: optional (N,) boolean array selecting the large-text threshold for "passes"
+        Returns a dict of (N,) arrays
+        """
+        l_fg = self.luminance_batch(foregrounds)
+        l_bg = self.luminance_batch(backgrounds)
+        ratios = (np.maximum(l_fg, l_bg) + 0.05) / (np.minimum(l_fg, l_bg) + 0.05)
+        
+        passes_normal = ratios >= self.MIN_CONTRAST_NORMAL
+        passes_large = ratios >= self.MIN_CONTRAST_LARGE
+        if large_text is None:
+            passes = passes_normal
+        else:
+            passes = np.where(np.asarray(large_text, dtype=bool), passes_large, passes_normal)
+        
+        return {
+            "foreground_luminance": l_fg,
+            "background_luminance": l_bg,
+            "contrast_ratio": ratios,
+            "passes_normal_text": passes_normal,
+            "passes_large_text": passes_large,
+            "passes_ui": ratios >= self.MIN_CONTRAST_UI,
+            "passes": passes
+        }
+    
+    def is_large_text(self, font_size_px, font_weight):
         """
-        Extracts dominant colors from an image region using K-means clustering
+        WCAG large-text classification of N computed font sizes (px) and weights, as an (N,) boolean array
+        """
+        size = np.asarray(font_size_px, dtype=np.float64)
+        bold = np.asarray(font_weight, dtype=np.float64) >= 700
+        return (size >= self.LARGE_TEXT_PX) | (bold & (size >= self.LARGE_BOLD_TEXT_PX))
+    
+    def evaluate_text_styles(self, styles):
         """
+        Scores computed text styles (dicts with color, background, font_size_px and font_weight)
+        Returns the evaluate_contrast_batch arrays plus "large_text" and "required_ratio"
+        """
+        if not styles:
+            empty = np.zeros(0)
+            return {key: empty for key in (
+                "foreground_luminance", "background_luminance", "contrast_ratio", "passes_normal_text",
+                "passes_large_text", "passes_ui", "passes", "large_text", "required_ratio"
+            )}
+        
+        large = self.is_large_text([s["font_size_px"] for s in styles], [s["font_weight"] for s in styles])
+        result = self.evaluate_contrast_batch(
+            [s["color"] for s in styles], [s["background"] for s in styles], large_text=large
+        )
+        result["large_text"] = large
+        result["required_ratio"] = np.where(large, self.MIN_CONTRAST_LARGE, self.MIN_CONTRAST_NORMAL)
+        return result
+    
+    def extract_dominant_colors(self, image_data, n_colors=2, method="fast"):
+        """
+        Extracts dominant colors from an image region, most common first
+        method: "fast" (histogram-seeded k-means, see _dominant_colors_fast) or "kmeans" (sklearn KMeans on every pixel)
+        """
+        if method == "fast":
+            return self._dominant_colors_fast(image_data, n_colors)
+        
+        from sklearn.cluster import KMeans
+        
         # Reshaping image for clustering
         pixels = np.float32(image_data.reshape(-1, 3))
         
@@ -64,6 +149,62 @@ class ContrastAnalyzer:
         colors_with_counts = sorted(zip(colors, counts), key=lambda x: x[1], reverse=True)
         return [color.tolist() for color, _ in colors_with_counts]
     
+    def _dominant_colors_fast(self, image_data, n_colors, max_pixels=16384, bits=4, iterations=5):
+        """
+        Dominant colors by histogram quantization and a few weighted k-means steps
+        Pixels are binned into 2^(3*bits) color cells; k-means then runs on the occupied
+        cell means weighted by their counts, seeded from the most populated distinct cells.
+        Large regions are subsampled with a fixed stride first.
+        """
+        pixels = image_data.reshape(-1, image_data.shape[-1])[:, :3]
+        if len(pixels) > max_pixels:
+            pixels = pixels[::-(-len(pixels) // max_pixels)]
+        
+        # Binning pixels into quantized color cells
+        shift = 8 - bits
+        quantized = pixels.astype(np.int32) >> shift
+        cells = (quantized[:, 0] << (2 * bits)) | (quantized[:, 1] << bits) | quantized[:, 2]
+        n_cells = 1 << (3 * bits)
+        counts = np.bincount(cells, minlength=n_cells)
+        sums = np.stack(
+            [np.bincount(cells, weights=pixels[:, c], minlength=n_cells) for c in range(3)], axis=1
+        )
+        
+        occupied = np.flatnonzero(counts)
+        weights = counts[occupied].astype(np.float64)
+        points = sums[occupied] / weights[:, None]
+        
+        # Seeding from the most populated cells at least two cell widths apart
+        order = np.argsort(-weights, kind="stable")
+        min_distance = (2 << shift) ** 2
+        seeds = []
+        for i in order:
+            if all(np.sum((points[i] - points[j]) ** 2) > min_distance for j in seeds):
+                seeds.append(i)
+                if len(seeds) == n_colors:
+                    break
+        for i in order:
+            if len(seeds) == n_colors:
+                break
+            if i not in seeds:
+                seeds.append(i)
+        centers = points[seeds]
+        
+        # Fixed number of weighted Lloyd iterations
+        for _ in range(iterations):
+            labels = np.argmin(((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2), axis=1)
+            cluster_weights = np.bincount(labels, weights=weights, minlength=len(centers))
+            for k in np.flatnonzero(cluster_weights):
+                members = labels == k
+                centers[k] = (points[members] * weights[members, None]).sum(axis=0) / cluster_weights[k]
+        
+        labels = np.argmin(((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2), axis=1)
+        cluster_weights = np.bincount(labels, weights=weights, minlength=len(centers))
+        
+        # Sorting colors by frequency (most common first)
+        ranked = np.argsort(-cluster_weights, kind="stable")
+        return [centers[k].astype(int).tolist() for k in ranked if cluster_weights[k] > 0]
+    
     def analyze_text_contrast(self, text_region, background_region):
         """
         Analyzes contrast between text and background regions
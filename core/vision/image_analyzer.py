@@ -1,20 +1,92 @@
+import io
 import os
 import cv2
+import hashlib
+import threading
 import numpy as np
 import logging
 import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
 
 logger = logging.getLogger("accessai.vision.image")
 
+# Longest side images are downscaled to before analysis
+ANALYSIS_SIZE = 256
+
+# Images larger than this after draft-mode reduction are skipped rather than decoded; only
+# JPEG decodes at reduced size, so PNG, GIF and WebP would otherwise be held in full
+MAX_DECODE_PIXELS = 4096 * 4096
+
+# Thumbnails triaged per (N, S, S) stack, bounding transient memory on image-heavy pages
+TRIAGE_CHUNK = 64
+
+def _array_hash(image):
+    """Content hash of a decoded image, including its shape"""
+    if image is None:
+        return "none"
+    digest = hashlib.sha1(str(image.shape).encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+def _gray_thumbnail(image, size):
+    """
+    Grayscale copy of a decoded image, downscaled so its longest side is at most size
+    Returns None for a missing or empty image
+    """
+    if image is None or image.size == 0:
+        return None
+    if image.ndim == 3:
+        code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        gray = cv2.cvtColor(image, code)
+    else:
+        gray = image
+    
+    scale = size / max(gray.shape[:2])
+    if scale < 1:
+        gray = cv2.resize(gray, (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale))), interpolation=cv2.INTER_AREA)
+    return np.ascontiguousarray(gray, dtype=np.uint8)
+
+def _decode_thumbnail(blob, size):
+    """
+    Decode an encoded image straight to a downscaled grayscale array
+    JPEGs are decoded at reduced resolution (draft mode), so large photos never decode in full;
+    other formats decode in full, so those above MAX_DECODE_PIXELS give None. Opening only reads
+    the header, so the dimensions are checked before any pixel data is decoded
+    """
+    try:
+        image = Image.open(io.BytesIO(blob))
+        image.draft("L", (size, size))
+        width, height = image.size
+        if width * height > MAX_DECODE_PIXELS:
+            logger.warning(f"Skipping {width}x{height} image: above {MAX_DECODE_PIXELS} pixels")
+            return None
+        image = image.convert("L")
+        image.thumbnail((size, size), Image.BOX)
+        return np.asarray(image)
+    except Exception as e:
+        logger.warning(f"Failed to decode image: {str(e)}")
+        return None
+
 class ImageAnalyzer:
     """Uses computer vision to analyze images for accessibility issues"""
     
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, analysis_size=ANALYSIS_SIZE, cache_size=4096, max_workers=8):
         """
         Initialize the image analyzer with a pre-trained image classification model
+        Triage results are cached by image content, up to cache_size entries;
+        max_workers bounds the threads decoding images in analyze_encoded_batch
         """
         self.model_path = model_path
         self.model = None
+        self.analysis_size = analysis_size
+        self.cache_size = cache_size
+        self.max_workers = max_workers
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         if model_path and os.path.exists(model_path):
             logger.info(f"Loading image analysis model from {model_path}")
         else:
@@ -25,29 +97,113 @@ class ImageAnalyzer:
         Determine if an image is likely decorative or informative
         This would use a trained classifier in a full implementation
         """
+        return self.analyze_batch([image])[0]
+    
+    def analyze_batch(self, images, keys=None):
+        """
+        Decorative/informative triage of many decoded (BGR or grayscale) images at once
+        keys are optional cache keys (e.g. content hashes); without them the pixels are hashed
+        Returns one result dict per image, as analyze_decorative_vs_informative does
+        """
+        if keys is None:
+            keys = [_array_hash(image) for image in images]
+        return self._analyze_thumbnails(keys, lambda i: _gray_thumbnail(images[i], self.analysis_size))
+    
+    def analyze_encoded_batch(self, blobs):
+        """
+        Like analyze_batch for encoded image files (PNG, JPEG, ...), keyed by content hash
+        Images are decoded straight to downscaled grayscale on a bounded thread pool;
+        results are None for blobs that cannot be decoded
+        """
+        keys = [hashlib.sha1(blob).hexdigest() for blob in blobs]
+        return self._analyze_thumbnails(keys, lambda i: _decode_thumbnail(blobs[i], self.analysis_size), threaded=True)
+    
+    def _analyze_thumbnails(self, keys, load, threaded=False):
+        results = [None] * len(keys)
+        pending = {}
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[i] = dict(self._cache[key])
+                    self.cache_hits += 1
+                elif key in pending:
+                    # Duplicates within the batch are analyzed once
+                    pending[key].append(i)
+                    self.cache_hits += 1
+                else:
+                    pending[key] = [i]
+                    self.cache_misses += 1
+        if not pending:
+            return results
         
-        # Convert image to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        first = [indices[0] for indices in pending.values()]
+        if threaded:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                thumbnails = list(pool.map(load, first))
+        else:
+            thumbnails = [load(i) for i in first]
         
-        # Calculate image statistics
-        avg_intensity = np.mean(gray)
-        std_intensity = np.std(gray)
+        analyzed = [
+            (key, thumbnail) for key, thumbnail in zip(pending, thumbnails)
+            if thumbnail is not None and thumbnail.size > 0
+        ]
+        computed = self._triage(t for _, t in analyzed)
         
-        # Simple edge detection to measure complexity
-        edges = cv2.Canny(gray, 100, 200)
-        edge_density = np.sum(edges > 0) / (edges.shape[0] * edges.shape[1])
+        with self._cache_lock:
+            for (key, _), result in zip(analyzed, computed):
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+                for i in pending[key]:
+                    results[i] = dict(result)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return results
+    
+    def _triage(self, thumbnails):
+        """
+        Heuristic triage of grayscale thumbnails, with statistics computed TRIAGE_CHUNK at a time
+        """
+        thumbnails = list(thumbnails)
+        results = []
+        for start in range(0, len(thumbnails), TRIAGE_CHUNK):
+            results.extend(self._triage_chunk(thumbnails[start:start + TRIAGE_CHUNK]))
+        return results
+    
+    def _triage_chunk(self, thumbnails):
+        """
+        Thumbnails are padded into one float32 (N, S, S) stack; a mask keeps padding out of the statistics
+        """
+        size = self.analysis_size
+        stack = np.zeros((len(thumbnails), size, size), dtype=np.float32)
+        edges = np.zeros((len(thumbnails), size, size), dtype=bool)
+        mask = np.zeros((len(thumbnails), size, size), dtype=bool)
+        for n, gray in enumerate(thumbnails):
+            height, width = gray.shape
+            stack[n, :height, :width] = gray
+            # Simple edge detection to measure complexity
+            edges[n, :height, :width] = cv2.Canny(gray, 100, 200) > 0
+            mask[n, :height, :width] = True
+        
+        # Calculate image statistics, accumulating in float64
+        pixels = mask.sum(axis=(1, 2))
+        avg_intensity = stack.sum(axis=(1, 2), dtype=np.float64) / pixels
+        stack -= avg_intensity[:, None, None].astype(np.float32)
+        stack[~mask] = 0
+        std_intensity = np.sqrt(np.square(stack).sum(axis=(1, 2), dtype=np.float64) / pixels)
+        edge_density = edges.sum(axis=(1, 2)) / pixels
         
         # Heuristic: If image has high edge density and variance, it's likely informative
-        is_informative = edge_density > 0.05 and std_intensity > 40
+        is_informative = (edge_density > 0.05) & (std_intensity > 40)
         
-        confidence = min(0.95, max(0.6, edge_density * 5 + std_intensity / 100))
+        confidence = np.minimum(0.95, np.maximum(0.6, edge_density * 5 + std_intensity / 100))
         
-        return {
-            "is_informative": is_informative,
-            "confidence": round(confidence, 2),
-            "edge_density": round(edge_density, 3),
-            "recommendation": "Add descriptive alt text" if is_informative else "Consider marking as decorative"
-        }
+        return [{
+            "is_informative": bool(is_informative[n]),
+            "confidence": round(float(confidence[n]), 2),
+            "edge_density": round(float(edge_density[n]), 3),
+            "recommendation": "Add descriptive alt text" if is_informative[n] else "Consider marking as decorative"
+        } for n in range(len(thumbnails))]
     
     def analyze_alt_text_quality(self, image, alt_text):
         """
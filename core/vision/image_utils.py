@@ -0,0 +1,12 @@
+def crop_box(image, box, scale):
+    """
+    View of image covering a box given in CSS pixels
+    Returns None when the box falls outside the image or is empty
+    """
+    left = max(0, int(round(box["x"] * scale)))
+    top = max(0, int(round(box["y"] * scale)))
+    right = min(image.shape[1], int(round((box["x"] + box["width"]) * scale)))
+    bottom = min(image.shape[0], int(round((box["y"] + box["height"]) * scale)))
+    if right <= left or bottom <= top:
+        return None
+    return image[top:bottom, left:right]
@@ -1,9 +1,76 @@
 import cv2
 import numpy as np
 import logging
+from core.vision.image_utils import crop_box
 
 logger = logging.getLogger("accessai.vision.text_size")
 
+# Binarized crops are stacked into canvases of at most this many pixels (rows x widest crop)
+# for one labeling pass
+MAX_CANVAS_PIXELS = 8 * 1024 * 1024
+
+def _binarize(image):
+    """Grayscale and Otsu-threshold one crop so text pixels are 255"""
+    if image.ndim == 3:
+        gray = cv2.cvtColor(np.ascontiguousarray(image[..., :3]), cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return binary
+
+def _median_heights(binaries, min_height):
+    """
+    Median connected-component height of each binarized crop, from one labeling pass
+    Crops are stacked vertically with a blank row between them so components never merge;
+    each component is assigned to its crop by its top row.
+    """
+    offsets = np.cumsum([0] + [binary.shape[0] + 1 for binary in binaries])
+    canvas = np.zeros((offsets[-1], max(binary.shape[1] for binary in binaries)), dtype=np.uint8)
+    for binary, top in zip(binaries, offsets):
+        canvas[top:top + binary.shape[0], :binary.shape[1]] = binary
+
+    # Block-based decision-tree labeling, about twice as fast as the default on mostly-blank text crops
+    _, _, stats, _ = cv2.connectedComponentsWithStatsWithAlgorithm(canvas, 8, cv2.CV_32S, cv2.CCL_GRANA)
+    # Dropping the background label and noise
+    stats = stats[1:]
+    heights = stats[:, cv2.CC_STAT_HEIGHT]
+    keep = heights > min_height
+    heights = heights[keep]
+    crops = np.searchsorted(offsets, stats[keep, cv2.CC_STAT_TOP], side="right") - 1
+
+    # Per-crop medians from one sort by (crop, height)
+    sizes = np.zeros(len(binaries))
+    order = np.lexsort((heights, crops))
+    heights, crops = heights[order], crops[order]
+    counts = np.bincount(crops, minlength=len(binaries))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = np.flatnonzero(counts)
+    lower = heights[starts[present] + (counts[present] - 1) // 2]
+    upper = heights[starts[present] + counts[present] // 2]
+    sizes[present] = (lower + upper) / 2
+    return sizes
+
+def _estimate_chunk(crops, min_height=2):
+    """Text sizes of a list of crops; module-level so it can run in a process pool"""
+    sizes = np.zeros(len(crops))
+    valid = [i for i, crop in enumerate(crops) if crop is not None and crop.size > 0]
+
+    # Similar widths together, so narrow crops are not padded out to a wide one
+    valid.sort(key=lambda i: crops[i].shape[1])
+
+    batch, batch_rows, batch_width = [], 0, 0
+    for i in valid + [None]:
+        binary = _binarize(crops[i]) if i is not None else None
+        if batch and (binary is None or (batch_rows + binary.shape[0] + 1) * max(batch_width, binary.shape[1]) > MAX_CANVAS_PIXELS):
+            indices = [j for j, _ in batch]
+            sizes[indices] = _median_heights([b for _, b in batch], min_height)
+            batch, batch_rows, batch_width = [], 0, 0
+        if binary is not None:
+            batch.append((i, binary))
+            batch_rows += binary.shape[0] + 1
+            batch_width = max(batch_width, binary.shape[1])
+    return sizes
+
 class TextSizeAnalyzer:
     """Analyzes text size for readability"""
     
@@ -16,48 +83,53 @@ class TextSizeAnalyzer:
         Estimate the text size from an image of text
         Returns the estimated size in pixels
         """
-        # Converting image to grayscale
-        gray = cv2.cvtColor(text_element_image, cv2.COLOR_BGR2GRAY)
-        
-        # Applying thresholding to isolate text
-        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-        
-        # Finding contours which represent text components
-        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        if not contours:
-            return 0
-            
-        # Calculating height statistics of contours
-        heights = []
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            # Filter out very small components (noise)
-            if h > 2:
-                heights.append(h)
-        
-        if not heights:
-            return 0
-            
-        # Use median height as estimate of text size
-        # This is more robust than mean for text with mixed case
-        median_height = np.median(heights)
-        
-        return median_height
+        return self.estimate_text_sizes([text_element_image])[0]
+    
+    def estimate_text_sizes(self, images, executor=None, chunk_size=256):
+        """
+        Estimate the text size of many crops at once
+        Each crop is thresholded on its own, then all of them are labeled together with
+        connectedComponentsWithStats and the median component height (ignoring noise of
+        2px or less) is taken per crop. With an executor, chunks of crops run in parallel.
+        Returns an (N,) array of sizes in pixels; 0 where no text was found
+        """
+        images = list(images)
+        if executor is None or len(images) <= chunk_size:
+            return _estimate_chunk(images)
+    
+        chunks = [images[i:i + chunk_size] for i in range(0, len(images), chunk_size)]
+        return np.concatenate(list(executor.map(_estimate_chunk, chunks)))
+    
+    def estimate_page_text_sizes(self, page_image, boxes, scale=1.0, executor=None):
+        """
+        Estimate text sizes of many elements of one page capture
+        boxes are in CSS pixels (as from ScreenshotProcessor.get_element_boxes) and scale converts
+        them to image pixels; sizes are returned in CSS pixels, 0 for missing or empty boxes
+        """
+        crops = [crop_box(page_image, box, scale) if box else None for box in boxes]
+        return self.estimate_text_sizes(crops, executor) / scale
     
     def analyze_text_size(self, text_element_image):
         """
         Analyze if text size meets accessibility standards
         Returns size estimation and recommendation
         """
-        estimated_size = self.estimate_text_size(text_element_image)
-        
-        result = {
-            "estimated_size_px": round(estimated_size, 1),
-            "meets_standards": estimated_size >= self.MIN_TEXT_SIZE_PX
-        }
-        
-        if not result["meets_standards"]:
-            result["recommendation"] = f"Increase text size to at least {self.MIN_TEXT_SIZE_PX}px for better readability"
-        
-        return result
\ No newline at end of file
+        return self.analyze_text_sizes([self.estimate_text_size(text_element_image)])[0]
+    
+    def analyze_text_sizes(self, estimated_sizes):
+        """
+        Evaluate many estimated sizes (e.g. from estimate_page_text_sizes) against the minimum
+        Returns one result dict per size, as analyze_text_size does
+        """
+        results = []
+        for estimated_size in np.asarray(estimated_sizes, dtype=np.float64):
+            result = {
+                "estimated_size_px": round(float(estimated_size), 1),
+                "meets_standards": bool(estimated_size >= self.MIN_TEXT_SIZE_PX)
+            }
+    
+            if not result["meets_standards"]:
+                result["recommendation"] = f"Increase text size to at least {self.MIN_TEXT_SIZE_PX}px for better readability"
+    
+            results.append(result)
+        return results
@@ -1,14 +1,60 @@
 import logging
+from collections import defaultdict
 
 logger = logging.getLogger("accessai.vision.touch_target")
 
+class SpatialGrid:
+    """
+    Uniform grid over page boxes for neighbour queries without pairwise checks
+    Boxes covering more than max_cells cells are kept aside and returned by every query.
+    """
+
+    def __init__(self, cell_size=24, max_cells=64):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self.cells = defaultdict(list)
+        self.large = []
+
+    def _span(self, box):
+        size = self.cell_size
+        return (
+            range(int(box["x"] // size), int((box["x"] + box["width"]) // size) + 1),
+            range(int(box["y"] // size), int((box["y"] + box["height"]) // size) + 1)
+        )
+
+    def insert(self, key, box):
+        columns, rows = self._span(box)
+        if len(columns) * len(rows) > self.max_cells:
+            self.large.append(key)
+            return
+        for column in columns:
+            for row in rows:
+                self.cells[(column, row)].append(key)
+
+    def query(self, box):
+        """Keys of the boxes sharing a cell with box (a superset of the ones intersecting it)"""
+        columns, rows = self._span(box)
+        keys = set(self.large)
+        for column in columns:
+            for row in rows:
+                keys.update(self.cells.get((column, row), ()))
+        return keys
+
+def _distance_to_box(x, y, box):
+    """Euclidean distance from a point to a box (0 inside it)"""
+    dx = max(box["x"] - x, 0, x - (box["x"] + box["width"]))
+    dy = max(box["y"] - y, 0, y - (box["y"] + box["height"]))
+    return (dx * dx + dy * dy) ** 0.5
+
 class TouchTargetAnalyzer:
     """Analyzes interactive elements for appropriate touch target size"""
     
     def __init__(self):
         """Initialize the touch target analyzer with required constants"""
-        # WCAG 2.5.5 recommends at least 44x44 CSS pixels
+        # WCAG 2.5.5 (AAA) recommends at least 44x44 CSS pixels
         self.MIN_TARGET_SIZE = 44
+        # WCAG 2.5.8 (AA) requires 24x24 CSS pixels, or enough spacing around smaller targets
+        self.MIN_TARGET_SIZE_AA = 24
     
     def analyze_touch_target(self, element_image, element_type="button"):
         """
@@ -36,4 +82,71 @@ class TouchTargetAnalyzer:
             else:
                 result["recommendation"] += " in height"
         
-        return result
\ No newline at end of file
+        return result
+    
+    def analyze_touch_targets(self, targets):
+        """
+        Check the boxes of all interactive elements of a page against WCAG 2.5.8
+        targets: dicts with a box in CSS pixels (as from collect_interactive_boxes), optionally
+        selector, tag and inline. A target smaller than 24x24 passes only if a 24px circle centered
+        on it intersects no other target and no other undersized target's circle; inline targets
+        are exempt. Neighbours come from a spatial grid, so the check stays near-linear.
+        Returns one result dict per failing target
+        """
+        minimum = self.MIN_TARGET_SIZE_AA
+        radius = minimum / 2
+        
+        grid = SpatialGrid(cell_size=minimum)
+        for i, target in enumerate(targets):
+            grid.insert(i, target["box"])
+    
+        def undersized(target):
+            box = target["box"]
+            return box["width"] < minimum or box["height"] < minimum
+        
+        offenders = []
+        for i, target in enumerate(targets):
+            if target.get("inline") or not undersized(target):
+                continue
+            
+            box = target["box"]
+            cx = box["x"] + box["width"] / 2
+            cy = box["y"] + box["height"] / 2
+            # Undersized neighbours' circles reach up to 2 radii away
+            reach = {"x": cx - minimum, "y": cy - minimum, "width": 2 * minimum, "height": 2 * minimum}
+            
+            conflicts = []
+            for j in sorted(grid.query(reach)):
+                if j == i:
+                    continue
+                other = targets[j]
+                if _distance_to_box(cx, cy, other["box"]) < radius:
+                    conflicts.append(j)
+                elif undersized(other) and not other.get("inline"):
+                    other_box = other["box"]
+                    ox = other_box["x"] + other_box["width"] / 2
+                    oy = other_box["y"] + other_box["height"] / 2
+                    if ((cx - ox) ** 2 + (cy - oy) ** 2) ** 0.5 < minimum:
+                        conflicts.append(j)
+            
+            if not conflicts:
+                continue
+            
+            tag = target.get("tag", "element")
+            element_type = target.get("role") or ("link" if tag in ("a", "area") else tag)
+            offenders.append({
+                "index": i,
+                "selector": target.get("selector"),
+                "element_type": element_type,
+                "width_px": round(box["width"], 1),
+                "height_px": round(box["height"], 1),
+                "meets_minimum": False,
+                "meets_enhanced": False,
+                "conflicts": [targets[j].get("selector", j) for j in conflicts],
+                "recommendation": (
+                    f"Increase the size of this {element_type} to at least {minimum}x{minimum} pixels "
+                    f"or space it at least {minimum} pixels from neighbouring targets"
+                )
+            })
+        
+        return offenders
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -6,6 +6,12 @@ class ScanRequest(BaseModel):
     url: HttpUrl
     scan_type: str = "full"  # Options: "full", "visual", "semantic"
     callback_url: Optional[HttpUrl] = None
+    parser: Optional[str] = None  # Options: "html.parser", "lxml", "selectolax"; defaults to config
+
+class CrawlRequest(ScanRequest):
+    max_depth: int = Field(2, ge=0, le=10)  # Link hops followed from the seed URL
+    max_pages: int = Field(50, ge=1, le=1000)
+    respect_robots: bool = True
 
 class AccessibilityIssue(BaseModel):
     id: str
@@ -16,6 +22,7 @@ class AccessibilityIssue(BaseModel):
     wcag_reference: str
     recommendation: str
     screenshot_data: Optional[str] = None
+    page_url: Optional[str] = None  # Set for issues found by a site crawl
 
 class ScanResult(BaseModel):
     scan_id: str
@@ -1,20 +1,48 @@
 from fastapi import BackgroundTasks
-from models import ScanRequest, ScanResult
+from models import ScanRequest, ScanResult, CrawlRequest
 from datetime import datetime
 import uuid
 from utils.helper import return_scan_results_and_queue
-from fastapi import HTTPException, FastAPI
-from typing import List
-from scanner.worker import scan_queue, scan_results
+from fastapi import HTTPException, FastAPI, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+from storage.store import SEVERITY_RANK, encode_cursor, decode_cursor
+from scanner.worker import scan_queue, scan_results, get_worker_metrics, process_scan_async, process_crawl_async
+from scanner.fetcher import close_client
+from scanner.parsers import PARSER_BACKENDS
+from utils.config import SCAN_EXECUTION, WARMUP_MODELS
+from core.nlp.model_registry import model_registry
 
 app = FastAPI(title="AccessAI API", description="AI Accessibility Insight Agent")
 
 
+@app.on_event("startup")
+async def startup():
+    """
+    Load the configured NLP models before the first request needs them
+    """
+    if WARMUP_MODELS:
+        await run_in_threadpool(model_registry.warmup, WARMUP_MODELS)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Release pooled HTTP connections
+    """
+    await close_client()
+
+
 @app.post("/scan", response_model=ScanResult)
 async def create_scan(scan_request: ScanRequest, background_tasks: BackgroundTasks):
     """
     Endpoint to start a new accessibility scan
     """
+    if scan_request.parser and scan_request.parser not in PARSER_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Unknown parser: {scan_request.parser}")
+    
     scan_id = str(uuid.uuid4())
     
     # Creating a new scan result
@@ -30,8 +58,37 @@ async def create_scan(scan_request: ScanRequest, background_tasks: BackgroundTas
     # Storing in in-memory database
     scan_results[scan_id] = scan_result
     
-    # Adding to processing queue
-    scan_queue.put((scan_id, scan_request.url, scan_request.scan_type, scan_request.callback_url))
+    # Running on the event loop, or adding to processing queue
+    if SCAN_EXECUTION == "async":
+        background_tasks.add_task(process_scan_async, scan_id, scan_request.url, scan_request.scan_type, scan_request.callback_url, scan_request.parser)
+    else:
+        scan_queue.put((scan_id, scan_request.url, scan_request.scan_type, scan_request.callback_url, scan_request.parser))
+    
+    return scan_result
+
+@app.post("/crawl", response_model=ScanResult)
+async def create_crawl(crawl_request: CrawlRequest, background_tasks: BackgroundTasks):
+    """
+    Endpoint to start an accessibility scan of a whole site from a seed URL
+    """
+    if crawl_request.parser and crawl_request.parser not in PARSER_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Unknown parser: {crawl_request.parser}")
+    
+    scan_id = str(uuid.uuid4())
+    
+    # Creating a new scan result for the aggregated crawl
+    scan_result = ScanResult(
+        scan_id=scan_id,
+        url=crawl_request.url,
+        status="queued",
+        scan_type=crawl_request.scan_type,
+        timestamp=datetime.now(),
+        issues=[]
+    )
+    scan_results[scan_id] = scan_result
+    
+    # Crawling runs on the event loop, streaming pages through the analysis pipeline
+    background_tasks.add_task(process_crawl_async, scan_id, crawl_request)
     
     return scan_result
 
@@ -46,11 +103,58 @@ async def get_scan_result(scan_id: str):
     return scan_results[scan_id]
 
 @app.get("/scans", response_model=List[ScanResult])
-async def list_scans():
+async def list_scans(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    url_prefix: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    min_severity: Optional[str] = None,
+    summary_only: bool = False,
+    format: str = "json"
+):
     """
-    Endpoint to list all scans
+    Endpoint to list scans, newest first
+    Pages are chained through the X-Next-Cursor response header; format=ndjson streams every match
     """
-    return list(scan_results.values())
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+    if min_severity is not None and min_severity not in SEVERITY_RANK:
+        raise HTTPException(status_code=400, detail=f"Unknown severity: {min_severity}")
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    filters = {
+        "status": status,
+        "url_prefix": url_prefix,
+        "since": since,
+        "until": until,
+        "min_severity": min_severity
+    }
+    exclude = {"issues"} if summary_only else None
+    store = scan_results.store
+    
+    # Streaming bulk export, one scan per line
+    if format == "ndjson":
+        def export_lines():
+            for scan in store.iter_scans(include_issues=not summary_only, cursor=cursor, **filters):
+                yield scan.json(exclude=exclude) + "\n"
+        
+        return StreamingResponse(export_lines(), media_type="application/x-ndjson")
+    
+    # Querying and serializing off the event loop
+    def load_page():
+        scans = store.list_scans(limit=limit, include_issues=not summary_only, cursor=cursor, **filters)
+        return scans, jsonable_encoder([scan.dict(exclude=exclude) for scan in scans])
+    
+    scans, content = await run_in_threadpool(load_page)
+    
+    headers = {"X-Next-Cursor": encode_cursor(scans[-1])} if len(scans) == limit else {}
+    return JSONResponse(content=content, headers=headers)
 
 @app.delete("/scan/{scan_id}")
 async def delete_scan(scan_id: str):
@@ -61,4 +165,11 @@ async def delete_scan(scan_id: str):
         raise HTTPException(status_code=404, detail="Scan not found")
     
     del scan_results[scan_id]
-    return {"status": "deleted"}
\ No newline at end of file
+    return {"status": "deleted"}
+
+@app.get("/workers")
+async def worker_status():
+    """
+    Endpoint to inspect the scan worker pool
+    """
+    return get_worker_metrics()
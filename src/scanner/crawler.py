@@ -0,0 +1,179 @@
+import asyncio
+import logging
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+from scanner.fetcher import get_client, host_limiter
+from scanner.scanner import scan_response_async, scan_error_issue
+from utils.config import CRAWL_CONCURRENCY
+
+logger = logging.getLogger("accessai")
+
+USER_AGENT = "AccessAI"
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_url(url, base=None):
+    """
+    Resolve url against base and normalize it for deduplication
+    Returns None for links that are not http(s) pages
+    """
+    if base is not None:
+        url = urljoin(base, url.strip())
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    # Lowercasing the host and dropping default ports and fragments
+    netloc = parts.hostname.lower()
+    if parts.port and parts.port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{parts.port}"
+
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+def origin_of(url):
+    """Scheme and host of a normalized URL"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+class SiteCrawler:
+    """Crawls same-origin pages from a seed URL and scans each one as it arrives"""
+
+    def __init__(self, seed_url, scan_type="full", max_depth=2, max_pages=50,
+                 parser=None, executor=None, respect_robots=True, concurrency=CRAWL_CONCURRENCY):
+        self.seed_url = normalize_url(str(seed_url))
+        self.origin = origin_of(self.seed_url)
+        self.scan_type = scan_type
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.parser = parser
+        self.executor = executor
+        self.respect_robots = respect_robots
+        self.concurrency = concurrency
+
+        self.seen = set()
+        # Final URLs of redirected pages, so links straight to them are not fetched again
+        self.redirect_targets = set()
+        self.robots = None
+        self.pages = []
+        # Earliest loop time the next request may start, per host, when robots.txt sets a crawl delay
+        self._next_fetch_at = {}
+
+    async def _load_robots(self):
+        """Fetch and parse robots.txt for the origin; missing or unreadable means allow all"""
+        robots = RobotFileParser()
+        try:
+            response = await get_client().get(f"{self.origin}/robots.txt", headers={"User-Agent": USER_AGENT})
+            robots.parse(response.text.splitlines() if response.status_code == 200 else [])
+        except Exception as e:
+            logger.warning(f"Could not read robots.txt for {self.origin}: {str(e)}")
+            robots.parse([])
+        self.robots = robots
+
+    def _allowed(self, url):
+        return not self.respect_robots or self.robots.can_fetch(USER_AGENT, url)
+
+    def _enqueue(self, queue, url, depth):
+        """Queue a URL once, within the page limit"""
+        if url is None or url in self.seen or url in self.redirect_targets or len(self.seen) >= self.max_pages:
+            return
+        if origin_of(url) != self.origin or not self._allowed(url):
+            return
+        self.seen.add(url)
+        queue.put_nowait((url, depth))
+
+    async def _wait_crawl_delay(self, url):
+        """
+        Reserve the host's next request slot and sleep until it comes up, so requests start
+        at least the robots.txt crawl delay apart however many run concurrently
+        """
+        delay = self.robots.crawl_delay(USER_AGENT) if self.respect_robots else None
+        if not delay:
+            return
+        host = urlsplit(url).netloc
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_fetch_at.get(host, now))
+        self._next_fetch_at[host] = slot + float(delay)
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _fetch(self, url):
+        """Fetch a page under the per-host cap, honoring the robots.txt crawl delay"""
+        await self._wait_crawl_delay(url)
+        async with host_limiter(url):
+            response = await get_client().get(url, headers={"User-Agent": USER_AGENT})
+        response.raise_for_status()
+        return response
+
+    async def _process(self, queue, url, depth, on_page):
+        """Fetch and check one page as scan_page_async would, report it, then queue its links"""
+        links = []
+        final_url = None
+        report = {}
+        try:
+            response = await self._fetch(url)
+            final_url = normalize_url(str(response.url)) or url
+            if final_url != url:
+                if final_url in self.seen or final_url in self.redirect_targets:
+                    logger.info(f"Skipping {url}: redirected to {final_url}, which is already queued")
+                    return
+                if depth == 0 and origin_of(final_url) != self.origin:
+                    # The seed redirected (e.g. http to https, or to www): crawl the site it landed on
+                    self.origin = origin_of(final_url)
+                    if self.respect_robots:
+                        await self._load_robots()
+                elif origin_of(final_url) != self.origin:
+                    logger.info(f"Skipping {url}: redirected off-site to {final_url}")
+                    return
+                self.redirect_targets.add(final_url)
+            if "html" not in response.headers.get("content-type", "text/html"):
+                return
+
+            # Cached analysis, image triage and browser checks, as for a single page scan
+            issues, links = await scan_response_async(
+                final_url, response, self.scan_type, self.executor, self.parser, report, with_links=True
+            )
+        except Exception as e:
+            logger.error(f"Error crawling page {url}: {str(e)}")
+            issues = [scan_error_issue(e)]
+
+        for issue in issues:
+            issue.page_url = url
+        self.pages.append({"url": url, "depth": depth, "total_issues": len(issues), **report})
+        await on_page(url, issues)
+
+        if depth < self.max_depth:
+            # Relative links resolve against the page's final URL, after redirects
+            base = final_url or url
+            for link in links:
+                self._enqueue(queue, normalize_url(link, base=base), depth + 1)
+
+    async def crawl(self, on_page):
+        """
+        Crawl the site, awaiting on_page(url, issues) for every scanned page
+        Returns the list of visited pages with their depth and issue counts
+        """
+        if self.respect_robots:
+            await self._load_robots()
+
+        queue = asyncio.Queue()
+        self._enqueue(queue, self.seed_url, 0)
+
+        async def crawl_worker():
+            while True:
+                url, depth = await queue.get()
+                try:
+                    await self._process(queue, url, depth, on_page)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(crawl_worker()) for _ in range(self.concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        return self.pages
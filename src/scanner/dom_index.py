@@ -0,0 +1,67 @@
+# Per-document index built during the RuleEngine walk
+#
+# Lets rules resolve id references and label associations with dictionary lookups
+# instead of searching the tree again for every element.
+
+# Elements that can be associated with a label
+LABELABLE_TAGS = frozenset(["input", "select", "textarea", "button", "meter", "output", "progress"])
+
+class DocumentIndex:
+    """Index of ids and label associations for one document"""
+
+    def __init__(self):
+        # id -> first element with that id
+        self.ids = {}
+        # label for -> labels pointing at it
+        self.labels_for = {}
+        # id(element) -> (element, wrapping label); the element is kept so the key stays unique
+        self.wrapping_labels = {}
+
+    def add(self, node, context):
+        """
+        Record an element, called by the engine for every element in document order
+        """
+        element_id = node.get('id') if node.attrs else None
+        if element_id:
+            self.ids.setdefault(element_id, node)
+
+        name = node.name
+        if name == 'label':
+            target = node.get('for')
+            if target:
+                self.labels_for.setdefault(target, []).append(node)
+        elif name in LABELABLE_TAGS:
+            label = context.innermost('label')
+            if label is not None:
+                self.wrapping_labels[id(node)] = (node, label)
+
+    def get_element(self, element_id):
+        """The element with the given id, or None"""
+        return self.ids.get(element_id)
+
+    def labels(self, node):
+        """
+        Labels associated with an element, explicit (label for) first, then the wrapping label
+        """
+        labels = []
+        element_id = node.get('id')
+        if element_id:
+            labels.extend(self.labels_for.get(element_id, []))
+
+        wrapped = self.wrapping_labels.get(id(node))
+        if wrapped is not None and wrapped[0] is node and all(label is not wrapped[1] for label in labels):
+            labels.append(wrapped[1])
+        return labels
+
+    def labelledby(self, node):
+        """Existing elements referenced by the element's aria-labelledby"""
+        references = (node.get('aria-labelledby') or "").split()
+        return [self.ids[ref] for ref in references if ref in self.ids]
+
+    def has_accessible_label(self, node):
+        """
+        Whether an element is labelled by a label element, aria-labelledby or aria-label
+        """
+        if self.labels(node) or self.labelledby(node):
+            return True
+        return bool((node.get('aria-label') or "").strip())
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import httpx
+from utils.config import FETCH_MAX_CONNECTIONS, FETCH_MAX_CONNECTIONS_PER_HOST, FETCH_TIMEOUT
+
+logger = logging.getLogger("accessai")
+
+# Shared client, created lazily on the running event loop
+_client = None
+
+def _http2_available():
+    """
+    HTTP/2 needs the optional h2 package
+    """
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def get_client():
+    """
+    Return the shared pooled HTTP client, creating it on first use
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=FETCH_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=FETCH_MAX_CONNECTIONS,
+                max_keepalive_connections=FETCH_MAX_CONNECTIONS,
+            ),
+        )
+    return _client
+
+async def close_client():
+    """
+    Close the shared HTTP client and its pooled connections
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+class HostLimiter:
+    """Caps the number of concurrent requests made to a single host"""
+
+    def __init__(self, limit=FETCH_MAX_CONNECTIONS_PER_HOST):
+        self.limit = limit
+        self._semaphores = {}
+
+    def __call__(self, url):
+        host = httpx.URL(url).host
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.limit)
+        return self._semaphores[host]
+
+host_limiter = HostLimiter()
+
+async def fetch_page_async(url, headers=None):
+    """
+    Fetch a page without blocking the event loop; a 304 Not Modified response is returned as is
+    """
+    async with host_limiter(str(url)):
+        response = await get_client().get(str(url), headers=headers)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+async def post_callback_async(callback_url, payload):
+    """
+    Post scan results to a callback URL
+    """
+    try:
+        response = await get_client().post(str(callback_url), json=payload)
+        response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Failed to send callback: {str(e)}")
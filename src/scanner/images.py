@@ -0,0 +1,195 @@
+import asyncio
+import base64
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, unquote_to_bytes
+import requests
+from core.vision.image_analyzer import ImageAnalyzer, ANALYSIS_SIZE
+from scanner.fetcher import get_client, host_limiter
+from utils.config import IMAGE_FETCH_CONCURRENCY, IMAGE_MAX_BYTES, IMAGE_MAX_COUNT
+
+logger = logging.getLogger("accessai")
+
+# Shared analyzer, so its content-hash cache spans every scan in the process
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+def get_image_analyzer():
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = ImageAnalyzer()
+        return _analyzer
+
+class ImageTooLarge(Exception):
+    """An image exceeded the byte limit while downloading"""
+
+def _srcset_candidate(srcset):
+    """
+    The srcset candidate cheapest to analyze: the narrowest at least ANALYSIS_SIZE wide,
+    else the widest; for density descriptors, the lowest density
+    """
+    candidates = []
+    for entry in srcset.split(","):
+        parts = entry.split()
+        if not parts:
+            continue
+        descriptor = parts[1] if len(parts) > 1 else "1x"
+        try:
+            value = float(descriptor[:-1])
+        except ValueError:
+            continue
+        candidates.append((descriptor[-1], value, parts[0]))
+    if not candidates:
+        return None
+
+    widths = sorted((value, url) for unit, value, url in candidates if unit == "w")
+    if widths:
+        large_enough = [url for value, url in widths if value >= ANALYSIS_SIZE]
+        return large_enough[0] if large_enough else widths[-1][1]
+    return min(candidates, key=lambda candidate: candidate[1])[2]
+
+def resolve_image_urls(images, page_url):
+    """
+    Absolute URLs of image refs (src/srcset dicts from ImageAltRule), grouped for deduplication
+    Returns {url: [ref, ...]}, keeping at most IMAGE_MAX_COUNT distinct URLs
+    """
+    grouped = {}
+    for image in images:
+        source = _srcset_candidate(image.get("srcset") or "") or image.get("src")
+        if not source:
+            continue
+        url = urljoin(str(page_url), source.strip())
+        if not url.startswith(("http://", "https://", "data:")):
+            continue
+        if url not in grouped and len(grouped) >= IMAGE_MAX_COUNT:
+            continue
+        grouped.setdefault(url, []).append(image)
+    return grouped
+
+def _decode_data_url(url):
+    """Bytes of a data: URL"""
+    header, _, data = url.partition(",")
+    if header.endswith(";base64"):
+        return base64.b64decode(data)
+    return unquote_to_bytes(data)
+
+def _check_content(headers):
+    """Reject non-raster responses and declared sizes above the limit before reading the body"""
+    content_type = headers.get("content-type", "image/")
+    if not content_type.startswith("image/") or "svg" in content_type:
+        raise ValueError(f"Not a raster image: {content_type}")
+    length = headers.get("content-length")
+    if length and length.isdigit() and int(length) > IMAGE_MAX_BYTES:
+        raise ImageTooLarge(f"Image is {length} bytes")
+
+def fetch_image(url, session=None):
+    """
+    Download one image, stopping as soon as it exceeds IMAGE_MAX_BYTES
+    """
+    if url.startswith("data:"):
+        return _decode_data_url(url)
+
+    with (session or requests).get(url, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        _check_content(response.headers)
+        body = bytearray()
+        for chunk in response.iter_content(64 * 1024):
+            body.extend(chunk)
+            if len(body) > IMAGE_MAX_BYTES:
+                raise ImageTooLarge(f"Image exceeds {IMAGE_MAX_BYTES} bytes")
+        return bytes(body)
+
+async def fetch_image_async(url):
+    """
+    Download one image on the event loop through the shared client, under the per-host cap
+    """
+    if url.startswith("data:"):
+        return _decode_data_url(url)
+
+    async with host_limiter(url):
+        async with get_client().stream("GET", url) as response:
+            response.raise_for_status()
+            _check_content(response.headers)
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) > IMAGE_MAX_BYTES:
+                    raise ImageTooLarge(f"Image exceeds {IMAGE_MAX_BYTES} bytes")
+            return bytes(body)
+
+def fetch_images(urls):
+    """
+    Download many images with at most IMAGE_FETCH_CONCURRENCY in flight
+    Returns {url: bytes} for the images that could be fetched
+    """
+    def fetch(url):
+        try:
+            return url, fetch_image(url, session)
+        except Exception as e:
+            logger.info(f"Skipping image {url}: {str(e)}")
+            return url, None
+
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=IMAGE_FETCH_CONCURRENCY)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with ThreadPoolExecutor(max_workers=IMAGE_FETCH_CONCURRENCY) as pool:
+            return {url: blob for url, blob in pool.map(fetch, urls) if blob is not None}
+
+async def fetch_images_async(urls):
+    """
+    Async variant of fetch_images
+    """
+    semaphore = asyncio.Semaphore(IMAGE_FETCH_CONCURRENCY)
+
+    async def fetch(url):
+        async with semaphore:
+            try:
+                return url, await fetch_image_async(url)
+            except Exception as e:
+                logger.info(f"Skipping image {url}: {str(e)}")
+                return url, None
+
+    results = await asyncio.gather(*(fetch(url) for url in urls))
+    return {url: blob for url, blob in results if blob is not None}
+
+def apply_image_triage(issues, grouped, blobs, report=None):
+    """
+    Analyze the fetched images and annotate their alt text issues
+    The triage is a heuristic, and a missing alt attribute fails WCAG 1.1.1 either way, so
+    severities are kept; only the description and recommendation say which case the image
+    looks like. An empty alt is what a decorative image should have, so those issues are
+    dropped for images that look decorative. Identical images are analyzed once.
+    Returns the remaining issues
+    """
+    urls = list(blobs)
+    results = get_image_analyzer().analyze_encoded_batch([blobs[url] for url in urls])
+
+    issues_by_id = {issue.id: issue for issue in issues}
+    resolved = set()
+    for url, result in zip(urls, results):
+        if result is None:
+            continue
+        for image in grouped[url]:
+            issue = issues_by_id.get(image["issue_id"])
+            if issue is None:
+                continue
+            if image.get("empty_alt"):
+                if result["is_informative"]:
+                    issue.description += f" (image appears informative, confidence {result['confidence']})"
+                    issue.recommendation = 'Replace alt="" with alt text that conveys the image\'s content'
+                else:
+                    resolved.add(issue.id)
+            elif result["is_informative"]:
+                issue.description += f" (image appears informative, confidence {result['confidence']})"
+                issue.recommendation = "Add descriptive alt text that conveys the image's content"
+            else:
+                issue.description += f" (image appears decorative, confidence {result['confidence']})"
+                issue.recommendation = 'If the image is decorative, mark it with alt="" or role="presentation"; otherwise add descriptive alt text'
+
+    if report is not None:
+        report["images_fetched"] = len(blobs)
+        report["images_analyzed"] = sum(1 for result in results if result is not None)
+    return [issue for issue in issues if issue.id not in resolved]
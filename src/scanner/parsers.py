@@ -0,0 +1,152 @@
+import logging
+from bs4 import BeautifulSoup
+from scanner.rules import soup_children
+from utils.config import HTML_PARSER
+
+logger = logging.getLogger("accessai")
+
+# Pluggable HTML parser backends
+#
+# Every backend returns a root node exposing the small part of the BeautifulSoup
+# Tag API the rules use (name, attrs, get, has_attr, [], get_text, str) plus a
+# children function for the RuleEngine walk, so rules run unchanged on any backend.
+
+class ParserBackend:
+    """Base class for HTML parser backends"""
+
+    name = None
+
+    def is_available(self):
+        """Whether the backend's parser library is installed"""
+        return True
+
+    def parse(self, html):
+        """Parse html and return the root node"""
+        raise NotImplementedError
+
+    def children(self, node):
+        """Element children of a node"""
+        raise NotImplementedError
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup with one of its tree builders"""
+
+    def __init__(self, builder):
+        self.name = builder
+        self.builder = builder
+
+    def is_available(self):
+        try:
+            BeautifulSoup("", self.builder)
+            return True
+        except Exception:
+            return False
+
+    def parse(self, html):
+        return BeautifulSoup(html, self.builder)
+
+    def children(self, node):
+        return soup_children(node)
+
+class SelectolaxElement:
+    """Wraps a selectolax node in the Tag API used by the rules"""
+
+    __slots__ = ("node", "name", "_attrs")
+
+    def __init__(self, node, name=None):
+        self.node = node
+        self.name = name or node.tag
+        self._attrs = None
+
+    @property
+    def attrs(self):
+        if self._attrs is None:
+            # selectolax reports valueless attributes as None, BeautifulSoup as ""
+            self._attrs = {key: value if value is not None else "" for key, value in self.node.attributes.items()}
+        return self._attrs
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def has_attr(self, key):
+        return key in self.attrs
+
+    def __getitem__(self, key):
+        return self.attrs[key]
+
+    def get_text(self):
+        return self.node.text(deep=True, separator="")
+
+    def __str__(self):
+        return self.node.html or ""
+
+class SelectolaxDocument(SelectolaxElement):
+    """Document root wrapping the html element"""
+
+    __slots__ = ()
+
+    def __init__(self, tree):
+        super().__init__(tree, name="[document]")
+        self._attrs = {}
+
+class SelectolaxBackend(ParserBackend):
+    """Fast path on selectolax, preferring the lexbor engine"""
+
+    name = "selectolax"
+
+    def _parser_class(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+            return LexborHTMLParser
+        except ImportError:
+            from selectolax.parser import HTMLParser
+            return HTMLParser
+
+    def is_available(self):
+        try:
+            self._parser_class()
+            return True
+        except ImportError:
+            return False
+
+    def parse(self, html):
+        return SelectolaxDocument(self._parser_class()(html))
+
+    def children(self, node):
+        if isinstance(node, SelectolaxDocument):
+            root = node.node.root
+            return [SelectolaxElement(root)] if root is not None else []
+
+        # Skipping text and comment nodes
+        return [
+            SelectolaxElement(child) for child in node.node.iter(include_text=False)
+            if not child.tag.startswith(("-", "_", "!"))
+        ]
+
+PARSER_BACKENDS = {
+    "html.parser": SoupBackend("html.parser"),
+    "lxml": SoupBackend("lxml"),
+    "selectolax": SelectolaxBackend(),
+}
+
+# Availability of each backend, checked once per process
+_available = {}
+
+def get_parser_backend(name=None):
+    """
+    Resolve a backend by name, defaulting to the configured parser
+    Falls back to the pure-Python html.parser when the library is not installed
+    """
+    name = name or HTML_PARSER
+    backend = PARSER_BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+
+    if name not in _available:
+        _available[name] = backend.is_available()
+
+    if not _available[name]:
+        logger.warning(f"HTML parser backend '{name}' is not installed, falling back to html.parser")
+        return PARSER_BACKENDS["html.parser"]
+
+    return backend
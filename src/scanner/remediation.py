@@ -0,0 +1,36 @@
+import logging
+import threading
+from core.classification.remediation_generator import RemediationGenerator
+from utils.config import REMEDIATIONS
+
+logger = logging.getLogger("accessai")
+
+# Shared generator, so concurrent scans share its batched model calls
+_generator = None
+_generator_lock = threading.Lock()
+
+def get_remediation_generator():
+    global _generator
+    with _generator_lock:
+        if _generator is None:
+            _generator = RemediationGenerator()
+        return _generator
+
+def apply_remediations(issues, report=None):
+    """
+    Replace the issues' recommendations with specific remediations, as configured by REMEDIATIONS
+    Runs the model for "model", so call it off the event loop
+    """
+    if REMEDIATIONS not in ("templates", "model") or not issues:
+        return issues
+    try:
+        remediations = get_remediation_generator().generate_remediations(
+            issues, use_model=REMEDIATIONS == "model", report=report
+        )
+    except Exception as e:
+        logger.error(f"Failed to generate remediations: {str(e)}")
+        return issues
+
+    for issue, remediation in zip(issues, remediations):
+        issue.recommendation = remediation
+    return issues
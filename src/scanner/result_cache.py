@@ -0,0 +1,164 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from api.models import AccessibilityIssue
+from scanner.rules import RULESET_VERSION
+from utils.config import ANALYSIS_CACHE_BACKEND, ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_ENTRIES, ANALYSIS_CACHE_TTL
+
+# Cache of analysis results keyed on page content
+#
+# Unchanged pages skip parsing and every check: the issue list is stored under
+# (content hash, scan type, ruleset version). Per-URL validators (ETag, Last-Modified)
+# let a rescan send a conditional request and skip the download on 304.
+
+_WHITESPACE = re.compile(r"\s+")
+
+def content_hash(html):
+    """Hash of the page with whitespace runs collapsed"""
+    normalized = _WHITESPACE.sub(" ", html).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class InMemoryCacheBackend:
+    """LRU cache with a time-to-live, held in process memory"""
+
+    def __init__(self, max_entries=ANALYSIS_CACHE_ENTRIES, ttl=ANALYSIS_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class DiskCacheBackend:
+    """LRU cache with a time-to-live, in a SQLite file shared across restarts"""
+
+    def __init__(self, path=ANALYSIS_CACHE_PATH, max_entries=ANALYSIS_CACHE_ENTRIES, ttl=ANALYSIS_CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes = 0
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connect().execute("CREATE INDEX IF NOT EXISTS idx_cache_last_used ON cache(last_used)")
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        connection = self._connect()
+        row = connection.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if row[1] < now:
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return None
+        connection.execute("UPDATE cache SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        connection = self._connect()
+        now = time.time()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires, last_used) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now + self.ttl, now)
+        )
+
+        # Evicting expired entries, then the least recently used ones over the limit,
+        # every so often rather than on each write
+        self._writes += 1
+        if self._writes % 100:
+            return
+        connection.execute("DELETE FROM cache WHERE expires < ?", (now,))
+        connection.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+class AnalysisCache:
+    """Stores issue lists by page content and HTTP validators by URL"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def _issues_key(self, html_hash, scan_type, parser):
+        # Parser backends can build different trees from the same markup
+        return f"issues:{html_hash}:{scan_type}:{parser}:{RULESET_VERSION}"
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a URL scanned before"""
+        validators = self.backend.get(f"validators:{url}")
+        if not validators:
+            return {}
+
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def get_issues(self, html_hash, scan_type, parser):
+        """Fresh copies of the cached issues for this content and parser backend name, or None"""
+        issues = self.backend.get(self._issues_key(html_hash, scan_type, parser))
+        if issues is None:
+            return None
+        return [AccessibilityIssue(**dict(issue, id=str(uuid.uuid4()))) for issue in issues]
+
+    def get_unchanged(self, url, scan_type, parser):
+        """Cached issues for a URL whose server answered 304 Not Modified, or None"""
+        validators = self.backend.get(f"validators:{url}")
+        if not validators:
+            return None
+        return self.get_issues(validators["content_hash"], scan_type, parser)
+
+    def store(self, url, response_headers, html_hash, scan_type, parser, issues):
+        """Cache the issues for this content and the URL's validators"""
+        self.backend.set(self._issues_key(html_hash, scan_type, parser), [issue.dict() for issue in issues])
+        self.backend.set(f"validators:{url}", {
+            "etag": response_headers.get("etag"),
+            "last_modified": response_headers.get("last-modified"),
+            "content_hash": html_hash
+        })
+
+def create_analysis_cache(backend=ANALYSIS_CACHE_BACKEND):
+    """Build the configured cache; returns None when caching is disabled"""
+    if backend == "memory":
+        return AnalysisCache(InMemoryCacheBackend())
+    if backend == "disk":
+        return AnalysisCache(DiskCacheBackend())
+    return None
+
+analysis_cache = create_analysis_cache()
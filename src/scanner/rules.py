@@ -0,0 +1,356 @@
+import uuid
+from collections import defaultdict
+from bs4 import Tag
+from api.models import AccessibilityIssue
+from scanner.dom_index import DocumentIndex
+from utils.helper import check_image_accessibility
+
+# Bump whenever a rule changes what it reports, so cached analysis results are not reused
+RULESET_VERSION = "3"
+
+# Single-pass DOM rule engine
+#
+# Each rule declares the tags and attribute prefixes it cares about. The engine
+# walks the tree once and hands every element only to the rules interested in it,
+# instead of every check running its own find_all over the whole document.
+
+def make_issue(issue_type, severity, element_selector, description, wcag_reference, recommendation):
+    """
+    Build an AccessibilityIssue with a fresh id
+    """
+    return AccessibilityIssue(
+        id=str(uuid.uuid4()),
+        type=issue_type,
+        severity=severity,
+        element_selector=element_selector,
+        description=description,
+        wcag_reference=wcag_reference,
+        recommendation=recommendation
+    )
+
+def soup_children(node):
+    """
+    Element children of a BeautifulSoup node
+    """
+    return [child for child in node.children if isinstance(child, Tag)]
+
+class ScanContext:
+    """State shared by the rules during one walk"""
+
+    def __init__(self):
+        # Stacks of the currently open ancestors, for the tags rules asked to track
+        self.open_elements = defaultdict(list)
+        # Ids and label associations, complete by the time rules finish
+        self.index = DocumentIndex()
+        # Data rules collect for the caller rather than report as issues
+        self.outputs = {}
+
+    def innermost(self, tag_name):
+        """The closest open ancestor with the given tag name, or None"""
+        stack = self.open_elements.get(tag_name)
+        return stack[-1] if stack else None
+
+class Rule:
+    """Base class for checks run by the RuleEngine"""
+
+    # Tag names this rule wants to visit
+    tags = ()
+    # Any element with an attribute starting with one of these is visited
+    attr_prefixes = ()
+    # Tag names whose open ancestors should be tracked in the context
+    context_tags = ()
+    # Scan types this rule runs for
+    scan_types = ("full", "visual", "semantic")
+
+    def visit(self, node, context):
+        """Called once for every element the rule is interested in"""
+
+    def finish(self, context):
+        """Called after the walk; returns the rule's issues"""
+        return []
+
+class RuleEngine:
+    """Runs a set of rules over a document in a single tree walk"""
+
+    def __init__(self, rule_classes, children=soup_children):
+        self.rule_classes = list(rule_classes)
+        self.children = children
+
+    def run(self, root, scan_type="full", children=None, context=None, extra_rules=()):
+        """
+        Walk the tree under root once and return the issues of all rules
+        children overrides how element children are listed, for non-BeautifulSoup trees
+        Pass a context to read rule outputs after the walk; extra_rules run alongside the defaults
+        """
+        rule_classes = self.rule_classes + list(extra_rules)
+        rules = [rule_class() for rule_class in rule_classes if scan_type in rule_class.scan_types]
+        context = context if context is not None else ScanContext()
+
+        # Indexing rules by the tags and attribute prefixes they listen to
+        by_tag = defaultdict(list)
+        attr_rules = []
+        # Labels are always tracked so the index can record wrapping labels
+        tracked = {'label'}
+        for rule in rules:
+            for tag in rule.tags:
+                by_tag[tag].append(rule)
+            if rule.attr_prefixes:
+                attr_rules.append((rule, tuple(rule.attr_prefixes)))
+            tracked.update(rule.context_tags)
+
+        children = children or self.children
+        index = context.index
+        stack = [(root, False)]
+        while stack:
+            node, closing = stack.pop()
+            name = node.name
+
+            if closing:
+                context.open_elements[name].pop()
+                continue
+
+            if node is not root:
+                index.add(node, context)
+
+            interested = by_tag.get(name, ())
+            for rule in interested:
+                rule.visit(node, context)
+
+            if attr_rules and node.attrs:
+                for rule, prefixes in attr_rules:
+                    if rule in interested:
+                        continue
+                    if any(attr.startswith(prefixes) for attr in node.attrs):
+                        rule.visit(node, context)
+
+            if name in tracked:
+                context.open_elements[name].append(node)
+                stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children(node)))
+
+        issues = []
+        for rule in rules:
+            issues.extend(rule.finish(context))
+        return issues
+
+# Checks ported from utils.helper as rules
+
+class LanguageRule(Rule):
+    """The html element must declare the page language"""
+
+    tags = ("html",)
+
+    def __init__(self):
+        self.has_lang = False
+
+    def visit(self, node, context):
+        if node.get('lang'):
+            self.has_lang = True
+
+    def finish(self, context):
+        if self.has_lang:
+            return []
+        return [make_issue(
+            "semantic", "major", "html",
+            "Missing language attribute on HTML tag",
+            "3.1.1",
+            "Add lang attribute to the HTML tag, e.g. <html lang='en'>"
+        )]
+
+class TitleRule(Rule):
+    """The page must have a title element"""
+
+    tags = ("title",)
+
+    def __init__(self):
+        self.has_title = False
+
+    def visit(self, node, context):
+        self.has_title = True
+
+    def finish(self, context):
+        if self.has_title:
+            return []
+        return [make_issue(
+            "semantic", "major", "head",
+            "Missing page title",
+            "2.4.2",
+            "Add a descriptive <title> element within the <head> section"
+        )]
+
+class HeadingStructureRule(Rule):
+    """Page has an h1 and heading levels are not skipped"""
+
+    tags = ("h1", "h2", "h3", "h4", "h5", "h6")
+    scan_types = ("full", "semantic")
+
+    def __init__(self):
+        self.levels = []
+
+    def visit(self, node, context):
+        self.levels.append(int(node.name[1]))
+
+    def finish(self, context):
+        messages = []
+        if 1 not in self.levels:
+            messages.append("Page missing main heading (h1)")
+
+        levels = self.levels
+        for i in range(1, len(levels)):
+            if levels[i] > levels[i-1] + 1:
+                messages.append(f"Skipped heading level from h{levels[i-1]} to h{levels[i]}")
+
+        return [make_issue(
+            "semantic", "major", "headings", message,
+            "1.3.1",
+            "Ensure proper heading structure with no skipped levels"
+        ) for message in messages]
+
+class FormLabelRule(Rule):
+    """Form inputs must have an associated label"""
+
+    tags = ("input", "select", "textarea")
+    context_tags = ("form",)
+    scan_types = ("full", "semantic")
+
+    def __init__(self):
+        self.inputs = []
+
+    def visit(self, node, context):
+        if context.innermost('form') is None:
+            return
+
+        # Skip hidden inputs
+        if node.get('type') == 'hidden':
+            return
+        self.inputs.append(node)
+
+    def finish(self, context):
+        issues = []
+        for input_elem in self.inputs:
+            # Explicit (label for), implicit (wrapping label) and ARIA labelling all count
+            if context.index.has_accessible_label(input_elem):
+                continue
+
+            if not input_elem.get('id'):
+                message = f"Form input missing ID attribute: {input_elem}"
+            else:
+                message = f"Form input missing associated label: {input_elem}"
+
+            issues.append(make_issue(
+                "semantic", "critical", "form", message,
+                "4.1.2",
+                "Ensure all form inputs have proper labels and associations"
+            ))
+        return issues
+
+class AriaAttributeRule(Rule):
+    """ARIA attributes are used properly"""
+
+    attr_prefixes = ("aria-",)
+    scan_types = ("full", "semantic")
+
+    def __init__(self):
+        self.messages = []
+
+    def visit(self, node, context):
+        # Checking for aria-label without aria-role
+        if node.has_attr('aria-label') and not node.has_attr('role'):
+            self.messages.append(f"Element has aria-label but no role: {node}")
+
+        # Checking for invalid aria-hidden values
+        if node.has_attr('aria-hidden') and node['aria-hidden'] not in ['true', 'false']:
+            self.messages.append(f"Invalid aria-hidden value: {node}")
+
+    def finish(self, context):
+        return [make_issue(
+            "semantic", "major", message,
+            "Improper ARIA attribute usage",
+            "4.1.2",
+            "Review ARIA attribute usage and ensure proper implementation"
+        ) for message in self.messages]
+
+class LinkTextRule(Rule):
+    """Links have descriptive text"""
+
+    tags = ("a",)
+    scan_types = ("full", "semantic")
+
+    NON_DESCRIPTIVE = {'click here', 'read more', 'more', 'link'}
+
+    def __init__(self):
+        self.issues = []
+
+    def visit(self, node, context):
+        link_text = node.get_text().strip()
+        if not link_text or link_text.lower() in self.NON_DESCRIPTIVE:
+            self.issues.append(make_issue(
+                "semantic", "minor", f"a[href='{node.get('href', '#')}']",
+                "Non-descriptive link text",
+                "2.4.4",
+                "Use descriptive text that indicates the link's purpose"
+            ))
+
+    def finish(self, context):
+        return self.issues
+
+class ImageAltRule(Rule):
+    """Images have meaningful alt text"""
+
+    tags = ("img",)
+    scan_types = ("full", "visual")
+
+    def __init__(self):
+        self.issues = []
+        self.images = []
+
+    def visit(self, node, context):
+        is_accessible, issue = check_image_accessibility(node.get('src', ''), node)
+        if not is_accessible:
+            self.issues.append(make_issue(
+                "visual", "critical", f"img[src='{node.get('src', '')}']",
+                issue,
+                "1.1.1",
+                "Add a descriptive alt attribute to the image"
+            ))
+            # The image stage fetches these to tell informative images from decorative ones
+            self.images.append({
+                "src": node.get('src', ''),
+                "srcset": node.get('srcset', ''),
+                "issue_id": self.issues[-1].id,
+                "empty_alt": node.get('alt') is not None and not node.get('alt').strip()
+            })
+
+    def finish(self, context):
+        context.outputs['images'] = self.images
+        return self.issues
+
+class LinkCollectorRule(Rule):
+    """Collects link targets into context.outputs['links'] for the crawler"""
+
+    tags = ("a",)
+
+    def __init__(self):
+        self.links = []
+
+    def visit(self, node, context):
+        href = node.get('href')
+        if href:
+            self.links.append(href)
+
+    def finish(self, context):
+        context.outputs['links'] = self.links
+        return []
+
+# Rules run by scan_page, in reporting order
+DEFAULT_RULES = [
+    LanguageRule,
+    TitleRule,
+    HeadingStructureRule,
+    FormLabelRule,
+    AriaAttributeRule,
+    LinkTextRule,
+    ImageAltRule,
+]
+
+rule_engine = RuleEngine(DEFAULT_RULES)
@@ -1,9 +1,15 @@
+import asyncio
 import logging
 import requests
-from bs4 import BeautifulSoup
 import uuid
 from api.models import AccessibilityIssue
-from utils.helper import check_heading_structure, check_form_accessibility, check_aria_attributes, check_image_accessibility
+from scanner.fetcher import fetch_page_async
+from scanner.rules import rule_engine, RuleEngine, ScanContext, LinkCollectorRule
+from scanner.parsers import get_parser_backend
+from scanner.result_cache import analysis_cache, content_hash
+from scanner.visual import run_browser_checks, VISUAL_SCAN_TYPES
+from scanner.images import resolve_image_urls, fetch_images, fetch_images_async, apply_image_triage
+from utils.config import BROWSER_CHECKS, IMAGE_CHECKS
 
 
 logging.basicConfig(
@@ -12,143 +18,224 @@ logging.basicConfig(
 )
 logger = logging.getLogger("accessai")
 
-def scan_page(url, scan_type="full"):
+# Collects links alone, for crawled pages whose issues come from the analysis cache
+link_engine = RuleEngine([LinkCollectorRule])
+
+def fetch_page(url, headers=None):
+    """
+    Fetch a page; a 304 Not Modified response is returned as is
+    """
+    response = requests.get(url, timeout=30, headers=headers)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+def _cached_issues(url, response, scan_type, parser):
+    """
+    Issues cached for the fetched content, or None
+    Returns the content hash too, for storing a fresh analysis
+    """
+    if analysis_cache is None:
+        return None, None
+    parser_name = get_parser_backend(parser).name
+    if response.status_code == 304:
+        return analysis_cache.get_unchanged(url, scan_type, parser_name), None
+    
+    html_hash = content_hash(response.text)
+    return analysis_cache.get_issues(html_hash, scan_type, parser_name), html_hash
+
+def _store_issues(url, response, html_hash, scan_type, parser, issues):
+    if analysis_cache is not None:
+        analysis_cache.store(url, response.headers, html_hash, scan_type, get_parser_backend(parser).name, issues)
+
+def analyze_page(html, scan_type="full", parser=None):
+    """
+    Parse a page and run the accessibility checks on it
+    Kept free of I/O so it can run in a separate process
+    """
+    issues, _ = _analyze(html, scan_type, parser)
+    return issues
+
+def analyze_page_with_links(html, scan_type="full", parser=None):
+    """
+    Like analyze_page_with_images, also returning the raw link targets found in the same walk
+    """
+    issues, outputs = _analyze(html, scan_type, parser, extra_rules=[LinkCollectorRule])
+    return issues, outputs.get('images', []), outputs.get('links', [])
+
+def extract_links(html, parser=None):
+    """
+    Raw link targets of a page, without running the checks
+    """
+    backend = get_parser_backend(parser)
+    context = ScanContext()
+    link_engine.run(backend.parse(html), children=backend.children, context=context)
+    return context.outputs.get('links', [])
+
+def analyze_page_with_images(html, scan_type="full", parser=None):
+    """
+    Like analyze_page, also returning the images whose alt text failed, for the image stage
+    """
+    issues, outputs = _analyze(html, scan_type, parser)
+    return issues, outputs.get('images', [])
+
+def _analyze(html, scan_type, parser, extra_rules=()):
+    # Parsing HTML
+    backend = get_parser_backend(parser)
+    root = backend.parse(html)
+    
+    # Running all DOM checks in a single pass over the tree
+    context = ScanContext()
+    issues = rule_engine.run(root, scan_type, children=backend.children, context=context, extra_rules=extra_rules)
+    
+    return issues, context.outputs
+
+def _image_checks(page_url, issues, images, report):
+    """
+    Fetch the images flagged by the alt text check and refine their issues
+    Failures only skip the refinement
+    """
+    if not IMAGE_CHECKS or not images:
+        return issues
+    try:
+        grouped = resolve_image_urls(images, page_url)
+        issues = apply_image_triage(issues, grouped, fetch_images(list(grouped)), report)
+    except Exception as e:
+        logger.warning(f"Image checks failed for {page_url}: {str(e)}")
+    return issues
+
+async def _image_checks_async(page_url, issues, images, report):
+    """
+    Async variant of _image_checks; decoding and analysis run on the default thread pool
+    """
+    if not IMAGE_CHECKS or not images:
+        return issues
+    try:
+        grouped = resolve_image_urls(images, page_url)
+        blobs = await fetch_images_async(list(grouped))
+        loop = asyncio.get_running_loop()
+        issues = await loop.run_in_executor(None, apply_image_triage, issues, grouped, blobs, report)
+    except Exception as e:
+        logger.warning(f"Image checks failed for {page_url}: {str(e)}")
+    return issues
+
+def _browser_checks(url, scan_type, report):
+    """
+    Rendered-page issues for visual scan types; browser failures are reported, not raised
+    """
+    if not BROWSER_CHECKS or scan_type not in VISUAL_SCAN_TYPES:
+        return []
+    try:
+        issues, browser_report = run_browser_checks(url)
+    except Exception as e:
+        logger.warning(f"Browser checks failed for {url}: {str(e)}")
+        if report is not None:
+            report["browser_error"] = str(e)
+        return []
+    if report is not None:
+        report.update(browser_report)
+    return issues
+
+def scan_page(url, scan_type="full", executor=None, parser=None, report=None):
     """
     Main scanning function that coordinates the accessibility checks
+    If an executor is given, the analysis runs on it instead of the calling thread
+    If report is a dict, it is filled with details of the image and browser passes
     """
     logger.info(f"Scanning page: {url} (type: {scan_type})")
-    issues = []
     
     try:
-        # Fetching the page
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # Parsing HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Basic page checks
-        if not soup.find('html').get('lang'):
-            issues.append(AccessibilityIssue(
-                id=str(uuid.uuid4()),
-                type="semantic",
-                severity="major",
-                element_selector="html",
-                description="Missing language attribute on HTML tag",
-                wcag_reference="3.1.1",
-                recommendation="Add lang attribute to the HTML tag, e.g. <html lang='en'>"
-            ))
-            
-        if not soup.find('title'):
-            issues.append(AccessibilityIssue(
-                id=str(uuid.uuid4()),
-                type="semantic",
-                severity="major",
-                element_selector="head",
-                description="Missing page title",
-                wcag_reference="2.4.2",
-                recommendation="Add a descriptive <title> element within the <head> section"
-            ))
+        # Fetching the page, conditionally if it was scanned before
+        headers = analysis_cache.conditional_headers(str(url)) if analysis_cache else None
+        response = fetch_page(url, headers)
         
-        # Running semantic checks if requested
-        if scan_type in ["full", "semantic"]:
-            # Check heading structure
-            heading_issues = check_heading_structure(soup)
-            for issue in heading_issues:
-                issues.append(AccessibilityIssue(
-                    id=str(uuid.uuid4()),
-                    type="semantic",
-                    severity="major",
-                    element_selector="headings",
-                    description=issue,
-                    wcag_reference="1.3.1",
-                    recommendation="Ensure proper heading structure with no skipped levels"
-                ))
+        # Reusing the analysis of unchanged content
+        issues, html_hash = _cached_issues(str(url), response, scan_type, parser)
+        if issues is not None:
+            logger.info(f"Page unchanged, reusing cached analysis: {url}")
+        else:
+            if response.status_code == 304:
+                response = fetch_page(url)
+                html_hash = content_hash(response.text) if analysis_cache else None
             
-            # Checking form accessibility
-            form_issues = check_form_accessibility(soup)
-            for issue in form_issues:
-                issues.append(AccessibilityIssue(
-                    id=str(uuid.uuid4()),
-                    type="semantic",
-                    severity="critical",
-                    element_selector="form",
-                    description=str(issue),
-                    wcag_reference="4.1.2",
-                    recommendation="Ensure all form inputs have proper labels and associations"
-                ))
+            if executor is not None:
+                issues, images = executor.submit(analyze_page_with_images, response.text, scan_type, parser).result()
+            else:
+                issues, images = analyze_page_with_images(response.text, scan_type, parser)
+            issues = _image_checks(str(response.url), issues, images, report)
             
-            # Checking ARIA attributes
-            aria_issues = check_aria_attributes(soup)
-            for issue in aria_issues:
-                issues.append(AccessibilityIssue(
-                    id=str(uuid.uuid4()),
-                    type="semantic",
-                    severity="major",
-                    element_selector=str(issue),
-                    description="Improper ARIA attribute usage",
-                    wcag_reference="4.1.2",
-                    recommendation="Review ARIA attribute usage and ensure proper implementation"
-                ))
-            
-            # Checking all links have descriptive text
-            links = soup.find_all('a')
-            for link in links:
-                link_text = link.get_text().strip()
-                if not link_text or link_text.lower() in ['click here', 'read more', 'more', 'link']:
-                    issues.append(AccessibilityIssue(
-                        id=str(uuid.uuid4()),
-                        type="semantic",
-                        severity="minor",
-                        element_selector=f"a[href='{link.get('href', '#')}']",
-                        description="Non-descriptive link text",
-                        wcag_reference="2.4.4",
-                        recommendation="Use descriptive text that indicates the link's purpose"
-                    ))
+            _store_issues(str(url), response, html_hash, scan_type, parser, issues)
         
-        # Running visual checks if requested
-        if scan_type in ["full", "visual"]:
-            # Checking images for alt text
-            images = soup.find_all('img')
-            for img in images:
-                is_accessible, issue = check_image_accessibility(img.get('src', ''), img)
-                if not is_accessible:
-                    issues.append(AccessibilityIssue(
-                        id=str(uuid.uuid4()),
-                        type="visual",
-                        severity="critical",
-                        element_selector=f"img[src='{img.get('src', '')}']",
-                        description=issue,
-                        wcag_reference="1.1.1",
-                        recommendation="Add a descriptive alt attribute to the image"
-                    ))
-            
-            # In a real implementation, headless browser would be used to evaluate:
-            # - Color contrast
-            # - Text size
-            # - Element visibility
-            # - Interactive element size
-            # For MVP, I'll add a simulated issue for demonstration
-            issues.append(AccessibilityIssue(
-                id=str(uuid.uuid4()),
-                type="visual",
-                severity="major",
-                element_selector=".header .nav-link",
-                description="Low contrast text in navigation links",
-                wcag_reference="1.4.3",
-                recommendation="Increase contrast ratio to at least 4.5:1 for normal text"
-            ))
+        # Rendering always runs, since styles and scripts can change without the HTML changing
+        return issues + _browser_checks(url, scan_type, report)
         
+    except Exception as e:
+        logger.error(f"Error scanning page {url}: {str(e)}")
+        return [scan_error_issue(e)]
+
+async def scan_page_async(url, scan_type="full", executor=None, parser=None, report=None):
+    """
+    Async variant of scan_page that fetches on the event loop
+    Analysis runs on the executor (or the default thread pool) so the loop is never blocked;
+    the browser pass runs on the default thread pool
+    """
+    logger.info(f"Scanning page: {url} (type: {scan_type})")
+    
+    try:
+        headers = analysis_cache.conditional_headers(str(url)) if analysis_cache else None
+        response = await fetch_page_async(url, headers)
+        issues, _ = await scan_response_async(url, response, scan_type, executor, parser, report)
         return issues
         
     except Exception as e:
         logger.error(f"Error scanning page {url}: {str(e)}")
-        return [AccessibilityIssue(
-            id=str(uuid.uuid4()),
-            type="system",
-            severity="critical",
-            element_selector="",
-            description=f"Error scanning page: {str(e)}",
-            wcag_reference="",
-            recommendation="Check if the URL is valid and accessible"
-        )]
\ No newline at end of file
+        return [scan_error_issue(e)]
+
+async def scan_response_async(url, response, scan_type="full", executor=None, parser=None, report=None,
+                              with_links=False):
+    """
+    Check an already fetched page the way scan_page_async does: cached issues for unchanged
+    content, else the DOM checks and image triage, then the browser checks
+    Returns (issues, links); links are only collected with with_links, for the crawler
+    """
+    loop = asyncio.get_running_loop()
+    links = []
+    
+    issues, html_hash = _cached_issues(str(url), response, scan_type, parser)
+    if issues is not None:
+        logger.info(f"Page unchanged, reusing cached analysis: {url}")
+        if with_links:
+            links = await loop.run_in_executor(executor, extract_links, response.text, parser)
+    else:
+        if response.status_code == 304:
+            response = await fetch_page_async(url)
+            html_hash = content_hash(response.text) if analysis_cache else None
+        
+        if with_links:
+            issues, images, links = await loop.run_in_executor(
+                executor, analyze_page_with_links, response.text, scan_type, parser
+            )
+        else:
+            issues, images = await loop.run_in_executor(
+                executor, analyze_page_with_images, response.text, scan_type, parser
+            )
+        issues = await _image_checks_async(str(response.url), issues, images, report)
+        
+        _store_issues(str(url), response, html_hash, scan_type, parser, issues)
+    
+    browser_issues = await loop.run_in_executor(None, _browser_checks, url, scan_type, report)
+    return issues + browser_issues, links
+
+def scan_error_issue(error):
+    """
+    Build the issue reported when a page could not be scanned
+    """
+    return AccessibilityIssue(
+        id=str(uuid.uuid4()),
+        type="system",
+        severity="critical",
+        element_selector="",
+        description=f"Error scanning page: {str(error)}",
+        wcag_reference="",
+        recommendation="Check if the URL is valid and accessible"
+    )
\ No newline at end of file
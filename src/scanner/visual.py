@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+import uuid
+import numpy as np
+from api.models import AccessibilityIssue
+from core.browser.browser_pool import get_default_pool
+from core.browser.screenshot_processor import ScreenshotProcessor
+from core.vision.image_utils import crop_box
+from core.browser.text_styles import collect_text_styles
+from core.browser.interactive_elements import collect_interactive_boxes
+from core.vision.contrast_analyzer import ContrastAnalyzer
+from core.vision.touch_target_analyzer import TouchTargetAnalyzer
+
+logger = logging.getLogger("accessai")
+
+# Scan types that include the rendered-page checks
+VISUAL_SCAN_TYPES = ("full", "visual")
+
+contrast_analyzer = ContrastAnalyzer()
+touch_target_analyzer = TouchTargetAnalyzer()
+
+# Shared processor over the default browser pool, created on first use
+_processor = None
+_processor_lock = threading.Lock()
+
+def get_processor():
+    global _processor
+    with _processor_lock:
+        if _processor is None:
+            _processor = ScreenshotProcessor(pool=get_default_pool())
+        return _processor
+
+def _resolve_pixel_colors(processor, driver, styles):
+    """
+    Text and background colors of elements over background images or gradients,
+    from crops of one full-page capture; elements without two distinct colors are dropped
+    """
+    pending = [style for style in styles if style["needs_pixels"]]
+    if not pending:
+        return styles
+
+    image, scale = processor.capture_full_page(driver)
+    resolved = [style for style in styles if not style["needs_pixels"]]
+    for style in pending:
+        crop = crop_box(image, style["box"], scale)
+        if crop is None:
+            continue
+        colors = contrast_analyzer.extract_dominant_colors(crop, n_colors=2)
+        if len(colors) < 2:
+            continue
+        # The background covers most of the box, the text is the second color
+        resolved.append(dict(style, background=colors[0], color=colors[1]))
+    return resolved
+
+def contrast_issues(styles, result):
+    """
+    Issues for the text styles failing their WCAG 1.4.3 threshold
+    """
+    issues = []
+    for i in np.flatnonzero(~result["passes"]):
+        style = styles[i]
+        required = result["required_ratio"][i]
+        # Pushing text further from its background: lighter text gets lighter, darker text darker
+        if result["foreground_luminance"][i] > result["background_luminance"][i]:
+            direction = "lighten the color or darken the background-color"
+        else:
+            direction = "darken the color or lighten the background-color"
+        issues.append(AccessibilityIssue(
+            id=str(uuid.uuid4()),
+            type="visual",
+            severity="major",
+            element_selector=style["selector"],
+            description=(
+                f"Low contrast text ({result['contrast_ratio'][i]:.2f}:1): \"{style['text'][:40]}\""
+            ),
+            wcag_reference="1.4.3",
+            recommendation=(
+                f"Increase contrast ratio to at least {required:g}:1 for "
+                f"{'large' if result['large_text'][i] else 'normal'} text: {direction}"
+            )
+        ))
+    return issues
+
+def touch_target_issues(offenders):
+    """
+    Issues for the interactive elements failing WCAG 2.5.8 target size and spacing
+    """
+    issues = []
+    for offender in offenders:
+        neighbours = ", ".join(str(conflict) for conflict in offender["conflicts"][:3])
+        issues.append(AccessibilityIssue(
+            id=str(uuid.uuid4()),
+            type="visual",
+            severity="minor",
+            element_selector=offender["selector"],
+            description=(
+                f"Touch target too small ({offender['width_px']:g}x{offender['height_px']:g}px) "
+                f"and too close to {neighbours}"
+            ),
+            wcag_reference="2.5.8",
+            recommendation=offender["recommendation"]
+        ))
+    return issues
+
+def run_browser_checks(url):
+    """
+    Render the page in a pooled browser and run the checks that need computed styles or layout
+    Returns (issues, report) where report holds the page readiness and check counts
+    """
+    processor = get_processor()
+    started = time.monotonic()
+
+    with processor.open_page(str(url)) as driver:
+        # Colors come from computed styles; pixels are only read for image or gradient backgrounds
+        styles = collect_text_styles(driver)
+        pixel_count = sum(1 for style in styles if style["needs_pixels"])
+        styles = _resolve_pixel_colors(processor, driver, styles)
+        targets = collect_interactive_boxes(driver)
+
+    result = contrast_analyzer.evaluate_text_styles(styles)
+    issues = contrast_issues(styles, result)
+    issues.extend(touch_target_issues(touch_target_analyzer.analyze_touch_targets(targets)))
+
+    report = {
+        "page_readiness": processor.last_readiness,
+        "contrast_checked": len(styles),
+        "contrast_from_pixels": pixel_count,
+        "touch_targets_checked": len(targets),
+        "browser_ms": round((time.monotonic() - started) * 1000)
+    }
+    return issues, report
@@ -1,10 +1,21 @@
 from utils.helper import return_scan_results_and_queue, generate_summary
-from scanner.scanner import scan_page
+from utils.config import SCAN_WORKERS, ANALYSIS_PROCESSES, SCAN_DB_PATH, RESULT_CACHE_SIZE
+from scanner.scanner import scan_page, scan_page_async
+from scanner.fetcher import post_callback_async
+from scanner.crawler import SiteCrawler
+from scanner.remediation import apply_remediations
+from storage.store import CachedScanStore
+from storage.sqlite_store import SQLiteScanStore
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import requests
+import asyncio
 import logging
 import threading
+import atexit
+import json
 import queue
+import time
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,60 +24,215 @@ logging.basicConfig(
 logger = logging.getLogger("accessai")
 
 # Initialize the scan results and queue
+# Results persist in SQLite, with a bounded in-memory cache in front
 global scan_results, scan_queue
-scan_results = {}
+scan_results = CachedScanStore(SQLiteScanStore(SCAN_DB_PATH), max_size=RESULT_CACHE_SIZE)
 scan_queue = queue.Queue()
 
-def worker():
+# Per-worker metrics, keyed by worker name
+worker_metrics = {}
+metrics_lock = threading.Lock()
+
+# Process pool for CPU-heavy parsing and analysis, created by start_worker
+analysis_pool = None
+analysis_processes = 0
+
+def _update_metrics(worker_name, **changes):
+    """
+    Apply changes to a worker's metrics under the metrics lock
+    """
+    with metrics_lock:
+        metrics = worker_metrics[worker_name]
+        for key, value in changes.items():
+            if key in ("scans_completed", "scans_failed", "busy_seconds"):
+                metrics[key] += value
+            else:
+                metrics[key] = value
+
+def _set_status(scan_id, status):
+    """
+    Update a scan's status and write it back to the store
+    """
+    scan_result = scan_results.get(scan_id)
+    if scan_result is not None:
+        scan_result.status = status
+        scan_results[scan_id] = scan_result
+
+def _complete_scan(scan_id, issues, extra_summary=None):
+    """
+    Store the issues of a finished scan and mark it completed
+    """
+    scan_result = scan_results[scan_id]
+    scan_result.issues = issues
+    scan_result.status = "completed"
+    scan_result.completion_time = datetime.now()
+    scan_result.summary = generate_summary(issues)
+    if extra_summary:
+        scan_result.summary.update(extra_summary)
+    scan_results[scan_id] = scan_result
+
+async def process_scan_async(scan_id, url, scan_type, callback_url=None, parser=None):
+    """
+    Run a scan on the event loop using the async fetch pipeline
+    """
+    try:
+        _set_status(scan_id, "in_progress")
+
+        report = {}
+        issues = await scan_page_async(url, scan_type, executor=analysis_pool, parser=parser, report=report)
+        await asyncio.get_running_loop().run_in_executor(None, apply_remediations, issues, report)
+        _complete_scan(scan_id, issues, report)
+
+        if callback_url:
+            await post_callback_async(callback_url, json.loads(scan_results[scan_id].json()))
+
+        logger.info(f"Scan completed: {scan_id} (async)")
+
+    except Exception as e:
+        logger.error(f"Async scan error: {str(e)}")
+        _set_status(scan_id, "failed")
+
+async def process_crawl_async(scan_id, crawl_request):
+    """
+    Crawl a site and aggregate the issues of every page into one scan result
+    """
+    issues = []
+
+    async def on_page(url, page_issues):
+        issues.extend(page_issues)
+
+    try:
+        _set_status(scan_id, "in_progress")
+
+        crawler = SiteCrawler(
+            crawl_request.url,
+            scan_type=crawl_request.scan_type,
+            max_depth=crawl_request.max_depth,
+            max_pages=crawl_request.max_pages,
+            parser=crawl_request.parser,
+            executor=analysis_pool,
+            respect_robots=crawl_request.respect_robots
+        )
+        pages = await crawler.crawl(on_page)
+
+        # Remediations for the whole crawl at once, so repeated issues across pages share generations
+        report = {"pages_scanned": len(pages), "pages": pages}
+        await asyncio.get_running_loop().run_in_executor(None, apply_remediations, issues, report)
+        _complete_scan(scan_id, issues, report)
+
+        if crawl_request.callback_url:
+            await post_callback_async(crawl_request.callback_url, json.loads(scan_results[scan_id].json()))
+
+        logger.info(f"Crawl completed: {scan_id} ({len(pages)} pages)")
+
+    except Exception as e:
+        logger.error(f"Crawl error: {str(e)}")
+        _set_status(scan_id, "failed")
+
+def worker(worker_name="worker-0"):
     """
     Background worker that processes the scan queue
     """
+    with metrics_lock:
+        worker_metrics[worker_name] = {
+            "scans_completed": 0,
+            "scans_failed": 0,
+            "busy_seconds": 0.0,
+            "current_scan_id": None,
+            "last_scan_id": None,
+            "started_at": datetime.now(),
+        }
+
     while True:
+        scan_id = None
+        started = None
         try:
-            
-            scan_id, url, scan_type, callback_url = scan_queue.get()
-            
+
+            scan_id, url, scan_type, callback_url, parser = scan_queue.get()
+            started = time.monotonic()
+            _update_metrics(worker_name, current_scan_id=scan_id)
+
             # Update status to in_progress
-            scan_results[scan_id].status = "in_progress"
-            
+            _set_status(scan_id, "in_progress")
+
             # Perform the scan
-            issues = scan_page(url, scan_type)
-            
+            report = {}
+            issues = scan_page(url, scan_type, executor=analysis_pool, parser=parser, report=report)
+            apply_remediations(issues, report)
+
             # Update the scan result
-            scan_results[scan_id].issues = issues
-            scan_results[scan_id].status = "completed"
-            scan_results[scan_id].completion_time = datetime.now()
-            scan_results[scan_id].summary = generate_summary(issues)
-            
+            _complete_scan(scan_id, issues, report)
+
             # Send callback if provided
             if callback_url:
                 try:
                     requests.post(
                         str(callback_url),
-                        json=scan_results[scan_id].dict(),
+                        json=json.loads(scan_results[scan_id].json()),
                         headers={"Content-Type": "application/json"}
                     )
                 except Exception as e:
                     logger.error(f"Failed to send callback: {str(e)}")
-            
-            logger.info(f"Scan completed: {scan_id}")
-            
+
+            _update_metrics(worker_name, scans_completed=1)
+            logger.info(f"Scan completed: {scan_id} ({worker_name})")
+
         except Exception as e:
-            logger.error(f"Worker error: {str(e)}")
-            if scan_id in scan_results:
-                scan_results[scan_id].status = "failed"
-        
+            logger.error(f"Worker error ({worker_name}): {str(e)}")
+            _update_metrics(worker_name, scans_failed=1)
+            _set_status(scan_id, "failed")
+
         finally:
+            if started is not None:
+                _update_metrics(
+                    worker_name,
+                    busy_seconds=time.monotonic() - started,
+                    current_scan_id=None,
+                    last_scan_id=scan_id
+                )
             scan_queue.task_done()
 
-def start_worker():
+def get_worker_metrics():
     """
-    Start the background worker thread
+    Return a snapshot of the per-worker metrics and the queue depth
+    """
+    with metrics_lock:
+        workers = {name: dict(metrics) for name, metrics in worker_metrics.items()}
+
+    return {
+        "queue_depth": scan_queue.qsize(),
+        "analysis_processes": analysis_processes if analysis_pool else 0,
+        "workers": workers
+    }
+
+def start_worker(num_workers=None, num_processes=None):
     """
-    logger.info("Starting background worker thread")
-    
-    # Start the worker thread
-    worker_thread = threading.Thread(target=worker, daemon=True)
-    worker_thread.start()
-    logger.info("Background worker thread started")
-    return worker_thread
\ No newline at end of file
+    Start the background worker threads and the analysis process pool
+    """
+    global analysis_pool, analysis_processes
+
+    num_workers = SCAN_WORKERS if num_workers is None else num_workers
+    num_processes = ANALYSIS_PROCESSES if num_processes is None else num_processes
+    logger.info(f"Starting {num_workers} background worker threads")
+
+    # Start the analysis process pool
+    if num_processes > 0 and analysis_pool is None:
+        analysis_pool = ProcessPoolExecutor(max_workers=num_processes)
+        analysis_processes = num_processes
+        atexit.register(analysis_pool.shutdown, wait=False)
+        logger.info(f"Analysis process pool started with {num_processes} processes")
+
+    # Start the worker threads
+    worker_threads = []
+    for i in range(num_workers):
+        worker_thread = threading.Thread(
+            target=worker,
+            args=(f"worker-{i}",),
+            name=f"accessai-worker-{i}",
+            daemon=True
+        )
+        worker_thread.start()
+        worker_threads.append(worker_thread)
+
+    logger.info("Background worker threads started")
+    return worker_threads
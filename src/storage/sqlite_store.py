@@ -0,0 +1,208 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from api.models import ScanResult, AccessibilityIssue
+from storage.store import ScanStore, decode_cursor, severities_at_least
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    scan_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    completion_time TEXT,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scans_url ON scans(url);
+CREATE INDEX IF NOT EXISTS idx_scans_status ON scans(status);
+CREATE INDEX IF NOT EXISTS idx_scans_timestamp ON scans(timestamp);
+
+CREATE TABLE IF NOT EXISTS issues (
+    scan_id TEXT NOT NULL REFERENCES scans(scan_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    element_selector TEXT NOT NULL,
+    description TEXT NOT NULL,
+    wcag_reference TEXT NOT NULL,
+    recommendation TEXT NOT NULL,
+    screenshot_data TEXT,
+    page_url TEXT,
+    PRIMARY KEY (scan_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_issues_severity ON issues(severity);
+CREATE INDEX IF NOT EXISTS idx_issues_wcag ON issues(wcag_reference);
+"""
+
+SCAN_COLUMNS = ("scan_id", "url", "status", "scan_type", "timestamp", "completion_time", "summary")
+ISSUE_COLUMNS = ("id", "type", "severity", "element_selector", "description",
+                 "wcag_reference", "recommendation", "screenshot_data", "page_url")
+
+def _timestamp_bound(value):
+    """
+    ISO string comparable with the stored timestamps, which are naive datetime.now() values;
+    timezone-aware bounds are converted to that clock first
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+class SQLiteScanStore(ScanStore):
+    """Scan results in a SQLite database in WAL mode, one connection per thread"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+        return connection
+
+    def _scan_from_row(self, row, issues):
+        return ScanResult(
+            scan_id=row["scan_id"],
+            url=row["url"],
+            status=row["status"],
+            scan_type=row["scan_type"],
+            timestamp=datetime.fromisoformat(row["timestamp"]),
+            completion_time=datetime.fromisoformat(row["completion_time"]) if row["completion_time"] else None,
+            summary=json.loads(row["summary"]) if row["summary"] else None,
+            issues=issues
+        )
+
+    def _issues_for(self, scan_id):
+        rows = self._connect().execute(
+            f"SELECT {', '.join(ISSUE_COLUMNS)} FROM issues WHERE scan_id = ? ORDER BY position",
+            (scan_id,)
+        )
+        return [AccessibilityIssue(**dict(row)) for row in rows]
+
+    def get(self, scan_id):
+        row = self._connect().execute(
+            f"SELECT {', '.join(SCAN_COLUMNS)} FROM scans WHERE scan_id = ?", (scan_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._scan_from_row(row, self._issues_for(scan_id))
+
+    def save(self, scan_result):
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO scans ({', '.join(SCAN_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    scan_result.scan_id,
+                    str(scan_result.url),
+                    scan_result.status,
+                    scan_result.scan_type,
+                    scan_result.timestamp.isoformat(),
+                    scan_result.completion_time.isoformat() if scan_result.completion_time else None,
+                    json.dumps(scan_result.summary) if scan_result.summary is not None else None
+                )
+            )
+
+            # Replacing the stored issues with the current list
+            connection.execute("DELETE FROM issues WHERE scan_id = ?", (scan_result.scan_id,))
+            connection.executemany(
+                f"INSERT INTO issues (scan_id, position, {', '.join(ISSUE_COLUMNS)}) "
+                f"VALUES (?, ?, {', '.join('?' for _ in ISSUE_COLUMNS)})",
+                (
+                    (scan_result.scan_id, position) + tuple(getattr(issue, column) for column in ISSUE_COLUMNS)
+                    for position, issue in enumerate(scan_result.issues)
+                )
+            )
+
+    def delete(self, scan_id):
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM issues WHERE scan_id = ?", (scan_id,))
+            cursor = connection.execute("DELETE FROM scans WHERE scan_id = ?", (scan_id,))
+        return cursor.rowcount > 0
+
+    def _issues_for_many(self, scan_ids):
+        """Issues of several scans in one query, keyed by scan id"""
+        issues = {scan_id: [] for scan_id in scan_ids}
+        if not scan_ids:
+            return issues
+
+        rows = self._connect().execute(
+            f"SELECT scan_id, {', '.join(ISSUE_COLUMNS)} FROM issues "
+            f"WHERE scan_id IN ({', '.join('?' for _ in scan_ids)}) ORDER BY scan_id, position",
+            list(scan_ids)
+        )
+        for row in rows:
+            values = dict(row)
+            issues[values.pop("scan_id")].append(AccessibilityIssue(**values))
+        return issues
+
+    def list_scans(self, limit=None, include_issues=True, cursor=None, status=None,
+                   url_prefix=None, since=None, until=None, min_severity=None):
+        conditions = []
+        params = []
+
+        if cursor is not None:
+            # Keyset pagination on the (timestamp, scan_id) ordering
+            timestamp, scan_id = decode_cursor(cursor)
+            conditions.append("(timestamp < ? OR (timestamp = ? AND scan_id < ?))")
+            params.extend([timestamp, timestamp, scan_id])
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if url_prefix:
+            # A range keeps the url index usable, unlike LIKE
+            conditions.append("url >= ? AND url < ?")
+            params.extend([url_prefix, url_prefix + "\U0010ffff"])
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(_timestamp_bound(since))
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(_timestamp_bound(until))
+        if min_severity is not None:
+            severities = severities_at_least(min_severity)
+            conditions.append(
+                "EXISTS (SELECT 1 FROM issues WHERE issues.scan_id = scans.scan_id "
+                f"AND issues.severity IN ({', '.join('?' for _ in severities)}))"
+            )
+            params.extend(severities)
+
+        query = f"SELECT {', '.join(SCAN_COLUMNS)} FROM scans"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC, scan_id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        rows = self._connect().execute(query, params).fetchall()
+        issues = self._issues_for_many([row["scan_id"] for row in rows]) if include_issues else {}
+        return [self._scan_from_row(row, issues.get(row["scan_id"], [])) for row in rows]
+
+    def query_issues(self, scan_id=None, severity=None, wcag_reference=None, limit=None):
+        conditions = []
+        params = []
+        for column, value in (("scan_id", scan_id), ("severity", severity), ("wcag_reference", wcag_reference)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        query = f"SELECT {', '.join(ISSUE_COLUMNS)} FROM issues"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY scan_id, position"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [AccessibilityIssue(**dict(row)) for row in self._connect().execute(query, params)]
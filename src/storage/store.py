@@ -0,0 +1,114 @@
+import base64
+import json
+import threading
+from collections import OrderedDict
+
+# Issue severities from least to most severe
+SEVERITY_RANK = {"minor": 1, "major": 2, "critical": 3}
+
+def severities_at_least(min_severity):
+    """Severities ranked at or above min_severity"""
+    rank = SEVERITY_RANK[min_severity]
+    return [severity for severity, value in SEVERITY_RANK.items() if value >= rank]
+
+def encode_cursor(scan_result):
+    """Opaque pagination cursor pointing just after scan_result"""
+    raw = json.dumps([scan_result.timestamp.isoformat(), scan_result.scan_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    """(timestamp, scan_id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        timestamp, scan_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return timestamp, scan_id
+
+class ScanStore:
+    """Interface for scan result storage backends"""
+
+    def get(self, scan_id):
+        """Return the ScanResult with the given id, or None"""
+        raise NotImplementedError
+
+    def save(self, scan_result):
+        """Insert or replace a ScanResult and its issues"""
+        raise NotImplementedError
+
+    def delete(self, scan_id):
+        """Delete a scan and its issues; returns whether it existed"""
+        raise NotImplementedError
+
+    def list_scans(self, limit=None, include_issues=True, cursor=None, status=None,
+                   url_prefix=None, since=None, until=None, min_severity=None):
+        """
+        Return scans, newest first
+        cursor continues after a previous page; the other arguments filter the results
+        """
+        raise NotImplementedError
+
+    def iter_scans(self, batch_size=500, include_issues=True, cursor=None, **filters):
+        """Yield every matching scan, fetching one page at a time"""
+        while True:
+            batch = self.list_scans(limit=batch_size, include_issues=include_issues, cursor=cursor, **filters)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            cursor = encode_cursor(batch[-1])
+
+    def query_issues(self, scan_id=None, severity=None, wcag_reference=None, limit=None):
+        """Return issues matching the filters without loading whole results"""
+        raise NotImplementedError
+
+class CachedScanStore:
+    """
+    Bounded in-memory LRU cache in front of a ScanStore
+    Behaves like the dict it replaces; assigning a result writes it through to the store
+    """
+
+    def __init__(self, store, max_size=1000):
+        self.store = store
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, scan_id, scan_result):
+        with self._lock:
+            self._cache[scan_id] = scan_result
+            self._cache.move_to_end(scan_id)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def get(self, scan_id, default=None):
+        with self._lock:
+            if scan_id in self._cache:
+                self._cache.move_to_end(scan_id)
+                return self._cache[scan_id]
+
+        scan_result = self.store.get(scan_id)
+        if scan_result is None:
+            return default
+        self._remember(scan_id, scan_result)
+        return scan_result
+
+    def __getitem__(self, scan_id):
+        scan_result = self.get(scan_id)
+        if scan_result is None:
+            raise KeyError(scan_id)
+        return scan_result
+
+    def __setitem__(self, scan_id, scan_result):
+        self.store.save(scan_result)
+        self._remember(scan_id, scan_result)
+
+    def __contains__(self, scan_id):
+        return self.get(scan_id) is not None
+
+    def __delitem__(self, scan_id):
+        with self._lock:
+            self._cache.pop(scan_id, None)
+        if not self.store.delete(scan_id):
+            raise KeyError(scan_id)
+
+    def values(self):
+        return self.store.list_scans()
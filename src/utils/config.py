@@ -0,0 +1,54 @@
+import os
+from core.config import env_int
+
+# Runtime settings, overridable through environment variables
+
+# Number of threads fetching and analyzing queued scans
+SCAN_WORKERS = env_int("ACCESSAI_SCAN_WORKERS", min(32, (os.cpu_count() or 1) * 4))
+
+# Number of processes used for CPU-heavy parsing and analysis (0 runs analysis in the worker thread)
+ANALYSIS_PROCESSES = env_int("ACCESSAI_ANALYSIS_PROCESSES", os.cpu_count() or 1)
+
+# How queued scans are executed: "queue" runs them on the worker threads,
+# "async" runs them on the API's event loop with the async fetch pipeline
+SCAN_EXECUTION = os.environ.get("ACCESSAI_SCAN_EXECUTION", "queue")
+
+# Shared async HTTP client settings
+FETCH_TIMEOUT = env_int("ACCESSAI_FETCH_TIMEOUT", 30)
+FETCH_MAX_CONNECTIONS = env_int("ACCESSAI_FETCH_MAX_CONNECTIONS", 100)
+FETCH_MAX_CONNECTIONS_PER_HOST = env_int("ACCESSAI_FETCH_MAX_CONNECTIONS_PER_HOST", 6)
+
+# Default HTML parser backend: "html.parser", "lxml" or "selectolax"; lxml and selectolax are faster
+# but can build different trees from malformed markup
+HTML_PARSER = os.environ.get("ACCESSAI_HTML_PARSER", "html.parser")
+
+# Number of pages a site crawl fetches and analyzes at once
+CRAWL_CONCURRENCY = env_int("ACCESSAI_CRAWL_CONCURRENCY", 10)
+
+# SQLite database holding scan results
+SCAN_DB_PATH = os.environ.get("ACCESSAI_SCAN_DB_PATH", "accessai.db")
+
+# Number of scan results kept in memory in front of the database
+RESULT_CACHE_SIZE = env_int("ACCESSAI_RESULT_CACHE_SIZE", 1000)
+
+# Cache of analysis results for unchanged pages: "memory", "disk" or "none"
+ANALYSIS_CACHE_BACKEND = os.environ.get("ACCESSAI_ANALYSIS_CACHE", "memory")
+ANALYSIS_CACHE_PATH = os.environ.get("ACCESSAI_ANALYSIS_CACHE_PATH", "accessai-cache.db")
+ANALYSIS_CACHE_ENTRIES = env_int("ACCESSAI_ANALYSIS_CACHE_ENTRIES", 10000)
+ANALYSIS_CACHE_TTL = env_int("ACCESSAI_ANALYSIS_CACHE_TTL", 7 * 24 * 3600)
+
+# Render visual scans in a pooled headless browser for contrast checks (0 disables)
+BROWSER_CHECKS = env_int("ACCESSAI_BROWSER_CHECKS", 1) > 0
+
+# Images flagged by the alt text check are fetched and triaged as informative or decorative (0 disables)
+IMAGE_CHECKS = env_int("ACCESSAI_IMAGE_CHECKS", 1) > 0
+IMAGE_FETCH_CONCURRENCY = env_int("ACCESSAI_IMAGE_FETCH_CONCURRENCY", 16)
+IMAGE_MAX_BYTES = env_int("ACCESSAI_IMAGE_MAX_BYTES", 5 * 1024 * 1024)
+IMAGE_MAX_COUNT = env_int("ACCESSAI_IMAGE_MAX_COUNT", 200)
+
+# Comma-separated NLP models (e.g. "t5-small,t5-base") loaded at startup instead of on first use
+WARMUP_MODELS = [name.strip() for name in os.environ.get("ACCESSAI_WARMUP_MODELS", "").split(",") if name.strip()]
+
+# Issue recommendations: "templates" rewrites those with a matching fix template, "model" also
+# generates the rest with T5-small, "none" keeps the scanner's static recommendations
+REMEDIATIONS = os.environ.get("ACCESSAI_REMEDIATIONS", "templates")
@@ -1,4 +1,6 @@
+import re
 import queue
+from core.vision.contrast_analyzer import ContrastAnalyzer
 
 # Accessiblity standards
 
@@ -16,28 +18,84 @@ def return_wcag_guidelines():
     }
 
 # Visual accessibility checks
+def parse_css_color(value):
+    """
+    Parse a CSS hex or rgb()/rgba() color into (r, g, b, alpha)
+    Returns None for values that can't be resolved without a browser
+    """
+    value = (value or '').strip().lower()
+    if value.startswith('#'):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = ''.join(c * 2 for c in digits)
+        if len(digits) not in (6, 8):
+            return None
+        try:
+            channels = [int(digits[i:i + 2], 16) for i in range(0, len(digits), 2)]
+        except ValueError:
+            return None
+        alpha = channels[3] / 255 if len(channels) == 4 else 1.0
+        return channels[0], channels[1], channels[2], alpha
+    
+    match = re.match(r'rgba?\(([^)]*)\)$', value)
+    if not match:
+        return None
+    parts = [part for part in re.split(r'[\s,/]+', match.group(1)) if part]
+    if len(parts) not in (3, 4):
+        return None
+    try:
+        channels = [float(part[:-1]) * 2.55 if part.endswith('%') else float(part) for part in parts[:3]]
+        alpha = 1.0
+        if len(parts) == 4:
+            alpha = float(parts[3][:-1]) / 100 if parts[3].endswith('%') else float(parts[3])
+    except ValueError:
+        return None
+    return channels[0], channels[1], channels[2], alpha
+
 def check_color_contrast(element_style):
     """
-    Simple check for color contrast issues based on element style
-    In a real implementation, this would use a proper color contrast algorithm
+    Check text contrast against WCAG 1.4.3 from an element's color, background-color,
+    font-size and font-weight; semi-transparent colors are composited over the background
     """
-    # Mock implementation
-    foreground = element_style.get('color', '#000000')
-    background = element_style.get('background-color', '#FFFFFF')
+    foreground = parse_css_color(element_style.get('color', '#000000'))
+    background = parse_css_color(element_style.get('background-color', '#FFFFFF'))
+    if foreground is None or background is None:
+        return True, None
+    
+    # Compositing over white (the canvas), then the text over its background
+    bg_alpha = background[3]
+    bg = [c * bg_alpha + 255 * (1 - bg_alpha) for c in background[:3]]
+    fg_alpha = foreground[3]
+    fg = [c * fg_alpha + b * (1 - fg_alpha) for c, b in zip(foreground[:3], bg)]
+    
+    analyzer = ContrastAnalyzer()
+    ratio = analyzer.calculate_contrast_ratio(fg, bg)
     
-    # Simplified contrast check - would be more sophisticated later
-    if foreground == background:
-        return False, "No contrast between foreground and background"
+    font_size = element_style.get('font-size', '16px')
+    try:
+        size = float(font_size.replace('px', ''))
+    except ValueError:
+        size = 16.0
+    weight = element_style.get('font-weight', '400')
+    weight = 700 if weight == 'bold' else int(weight) if str(weight).isdigit() else 400
+    large = bool(analyzer.is_large_text([size], [weight])[0])
+    
+    required = analyzer.MIN_CONTRAST_LARGE if large else analyzer.MIN_CONTRAST_NORMAL
+    if ratio < required:
+        return False, f"Contrast ratio {ratio:.2f}:1 is below the required {required}:1"
     return True, None
 
 def check_image_accessibility(img_url, img_element):
     """
     Check if an image has appropriate alt text
     """
-    alt_text = img_element.get('alt', '')
-    if not alt_text:
+    alt_text = img_element.get('alt')
+    if alt_text is None:
         return False, "Missing alt text for image"
-    elif alt_text.lower() in ['image', 'photo', 'picture', 'img', '']:
+    elif not alt_text.strip():
+        # Right for decorative images only, which the image triage can tell apart
+        return False, "Empty alt text"
+    elif alt_text.lower() in ['image', 'photo', 'picture', 'img']:
         return False, "Generic or empty alt text"
     return True, None
 
@@ -54,69 +112,6 @@ def check_text_size(element_style):
         pass
     return True, None
 
-# Semantic accessibility checks
-def check_heading_structure(soup):
-    """
-    Check if heading structure is appropriate
-    """
-    issues = []
-    headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-    
-    if not soup.find('h1'):
-        issues.append("Page missing main heading (h1)")
-    
-    # Checking for skipped heading levels
-    heading_levels = [int(h.name[1]) for h in headings]
-    for i in range(1, len(heading_levels)):
-        if heading_levels[i] > heading_levels[i-1] + 1:
-            issues.append(f"Skipped heading level from h{heading_levels[i-1]} to h{heading_levels[i]}")
-    
-    return issues
-
-def check_form_accessibility(soup):
-    """
-    Check if forms are properly labeled and accessible
-    """
-    issues = []
-    forms = soup.find_all('form')
-    
-    for form in forms:
-        inputs = form.find_all(['input', 'select', 'textarea'])
-        for input_elem in inputs:
-            # Skip hidden inputs
-            if input_elem.get('type') == 'hidden':
-                continue
-                
-            input_id = input_elem.get('id')
-            if not input_id:
-                issues.append(f"Form input missing ID attribute: {input_elem}")
-                continue
-                
-            # Checking for associated label
-            label = form.find('label', attrs={'for': input_id})
-            if not label:
-                issues.append(f"Form input missing associated label: {input_elem}")
-    
-    return issues
-
-def check_aria_attributes(soup):
-    """
-    Check for proper ARIA attribute usage
-    """
-    issues = []
-    elements_with_aria = soup.find_all(lambda tag: any(attr.startswith('aria-') for attr in tag.attrs))
-    
-    for element in elements_with_aria:
-        # Checking for aria-label without aria-role
-        if element.has_attr('aria-label') and not element.has_attr('role'):
-            issues.append(f"Element has aria-label but no role: {element}")
-        
-        # Checking for invalid aria-hidden values
-        if element.has_attr('aria-hidden') and element['aria-hidden'] not in ['true', 'false']:
-            issues.append(f"Invalid aria-hidden value: {element}")
-    
-    return issues
-
 def generate_summary(issues):
     """
     Generate a summary of accessibility issues